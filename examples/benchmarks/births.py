@@ -0,0 +1,39 @@
+from typing import Callable
+from time import perf_counter
+from pyvolution.types.individual import (
+    create_birth_builder, create_gamete_builder, create_sequential_naming, select_half,
+    merge_karyograms, merge_ragged_karyograms, Merging
+)
+from pyvolution.types.population import create_sample_population, top_selector
+from pyvolution.birth import top_individuals_breed, top_individuals_batch_breed
+
+
+def measure(births: Callable[[], int], repetitions: int=5) -> float:
+    start = perf_counter()
+    born = sum(births() for _ in range(repetitions))
+    return born / (perf_counter() - start)
+
+
+def single_births(population, amount: int, merge: Merging) -> Callable[[], int]:
+    birth = create_birth_builder(create_gamete_builder(select_half), create_sequential_naming(), merge)
+
+    def give_births() -> int:
+        return len([birth(parents, 1) for parents in top_selector(2, population, amount)])
+    return give_births
+
+
+def main(size: int=8, haplodity: int=2, chromosome_length: int=32, parents: int=200, children: int=2000):
+    population = create_sample_population(parents, size=size, haplodity=haplodity, chromosome_length=chromosome_length)
+    fitness = lambda individual: 0
+    results = (
+        ('sorted merge', single_births(population, children, merge_ragged_karyograms)),
+        ('aligned merge', single_births(population, children, merge_karyograms)),
+        ('breed', lambda: len(list(top_individuals_breed(fitness)(population, children, 1)))),
+        ('batch breed', lambda: len(list(top_individuals_batch_breed(fitness)(population, children, 1)))),
+    )
+    for (name, births) in results:
+        print('{0:>15}: {1:10.0f} births/s'.format(name, measure(births)))
+
+
+if __name__ == '__main__':
+    main()
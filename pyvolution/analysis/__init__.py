@@ -1,8 +1,9 @@
-from typing import Callable, Sequence, TypeVar, Generator, Union, Tuple
+from typing import Callable, Sequence, TypeVar, Generator, Union, Tuple, Dict, Any
 from os import makedirs
 from os.path import join, exists
-from yaml import dump, load_all
+from yaml import dump, load, load_all, add_representer, FullLoader
 from attr import asdict
+from pyvolution.types.gene import FrozenChromosome
 from pyvolution.types.individual import Individual
 
 SerialisedIndividual = TypeVar('SerialisedIndividual')
@@ -10,6 +11,20 @@ IndividualStorage = Callable[[int, Sequence[SerialisedIndividual]], None]
 PopulationStorage = Callable[[int, Sequence[Union[Individual, Tuple[Individual, float]]]], None]
 GenerationLoader = Callable[[None], Generator[Sequence[Individual], None, None]]
 
+add_representer(FrozenChromosome, lambda dumper, chromosome: dumper.represent_dict(chromosome.items()))
+
+
+def serialise_attributes(individual: Individual) -> Dict[str, Any]:
+    """
+    asdict under the names of the init arguments, e.g. meta for the private _meta slot of CompactIndividual.
+    :param individual:
+    :return:
+    >>> from pyvolution.types.individual import CompactIndividual
+    >>> sorted(serialise_attributes(CompactIndividual({}, 0, 1)))
+    ['fitness', 'generation', 'karyogram', 'meta', 'name', 'parents']
+    """
+    return dict((key.lstrip('_'), value) for (key, value) in asdict(individual).items())
+
 
 def create_yaml_store(basedir: str, name: str='result', split: bool=True) -> IndividualStorage:
     makedirs(basedir, exist_ok=True)
@@ -19,41 +34,73 @@ def create_yaml_store(basedir: str, name: str='result', split: bool=True) -> Ind
 
     def yaml_dir_store(generation: int, population: Sequence[SerialisedIndividual]) -> None:
         with open(join(basedir, '{1}_{0}.yaml'.format(generation, name)), 'w') as out:
-            dump(population, allow_unicode=True)
+            dump(population, out, allow_unicode=True)
 
     return yaml_dir_store if split else yaml_file_store
 
 
-def create_yaml_loader(basedir: str, name: str='result', split: bool=True) -> Generator[Sequence[Individual], None, None]:
+def create_yaml_loader(
+        basedir: str,
+        name: str='result',
+        split: bool=True,
+        individual_type: Callable[..., Individual]=Individual
+) -> Generator[Sequence[Individual], None, None]:
+    """
+    :param basedir:
+    :param name:
+    :param split:
+    :param individual_type:
+    :return:
+    >>> from tempfile import TemporaryDirectory
+    >>> from pyvolution.types.individual import CompactIndividual
+    >>> from pyvolution.types.population import create_sample_population
+    >>> pop = [CompactIndividual(i.karyogram, 0, n, parents=(n, n + 1)) for (n, i) in enumerate(create_sample_population(3))]
+    >>> pop[0].meta['origin'] = 'lab'
+    >>> with TemporaryDirectory() as temp:
+    ...     store = create_population_storage(create_yaml_store(temp, 'compact'))
+    ...     store(0, [(individual, -1.0) for individual in pop])
+    ...     loaded = list(next(create_yaml_loader(temp, 'compact', individual_type=CompactIndividual)))
+    >>> [(i.karyogram, i.name, i.parents, i.fitness, i.meta) for i in loaded] == [
+    ...     (i.karyogram, i.name, i.parents, -1.0, i.meta) for i in pop
+    ... ]
+    True
+    >>> type(loaded[0]).__name__, loaded[0].meta, loaded[1].meta
+    ('CompactIndividual', {'origin': 'lab'}, {})
+    """
     if not split:
         with open(join(basedir, '{0}.yaml'.format(name))) as src:
-            for generation in load_all(src):
-                yield (Individual(**individual) for individual in generation)
+            for generation in load_all(src, Loader=FullLoader):
+                yield (individual_type(**individual) for individual in generation)
 
     else:
         gen = 0
         while exists(join(basedir, '{1}_{0}.yaml'.format(gen, name))):
             with open(join(basedir, '{1}_{0}.yaml'.format(gen, name))) as src:
-                yield (
-                    Individual(**individual)
-                    for individual in load_all(src)
-                )
+                generation = load(src, Loader=FullLoader)
+            yield (
+                individual_type(**individual)
+                for individual in generation
+            )
+            gen += 1
 
 
 def create_serialisation_pattern(serialisation: Callable[[Individual], SerialisedIndividual]):
     def serialise(individual: Union[Individual, Tuple[Individual, float]]) -> SerialisedIndividual:
-        if isinstance(individual, Individual):
+        if not isinstance(individual, tuple):
             return serialisation(individual)
         else:
             result = serialisation(individual[0])
-            result['meta']['fitness'] = individual[1]
+            if 'fitness' in result:
+                result['fitness'] = individual[1]
+            else:
+                result['meta']['fitness'] = individual[1]
             return result
     return serialise
 
 
 def create_population_storage(
         store: IndividualStorage,
-        serialisation: Callable[[Individual], SerialisedIndividual]=asdict
+        serialisation: Callable[[Individual], SerialisedIndividual]=serialise_attributes
 ) -> PopulationStorage:
     """
     :param store:
@@ -61,18 +108,18 @@ def create_population_storage(
     :return:
     >>> from tempfile import TemporaryDirectory
     >>> from pyvolution.types.population import create_sample_population
-    >>> from yaml import load_all
+    >>> from yaml import load_all, FullLoader
     >>> pop = list()
     >>> pop.extend(create_sample_population())
     >>> pop.extend(create_sample_population(generation=1))
     >>> with TemporaryDirectory() as temp:
-    ...     store = create_population_storage(create_yaml_store(temp, False))
+    ...     store = create_population_storage(create_yaml_store(temp, 'population', False))
     ...     store(0, pop)
     ...     store(1, pop)
-    ...     loader = create_yaml_loader(temp, False)
+    ...     loader = create_yaml_loader(temp, 'population', False)
     ...     loaded = list(i for gen in loader for i in gen)
     ...     with open(join(temp, 'population.yaml')) as src:
-    ...         zeros, ones= list(load_all(src))
+    ...         zeros, ones= list(load_all(src, Loader=FullLoader))
     ...
     >>> len(zeros), len(ones)
     (10, 10)
@@ -85,7 +132,7 @@ def create_population_storage(
             generation: int,
             individual: Union[Individual, Tuple[Individual, float]]
     ) -> bool:
-        if isinstance(individual, Individual):
+        if not isinstance(individual, tuple):
             return individual.generation == generation
         else:
             return individual[0].generation == generation
@@ -106,7 +153,7 @@ def create_population_storage(
 def create_population_subset_store(
         predicate: Callable[[int, Individual], bool],
         store: IndividualStorage,
-        serialisation: Callable[[Individual], SerialisedIndividual] = asdict
+        serialisation: Callable[[Individual], SerialisedIndividual] = serialise_attributes
 ) -> PopulationStorage:
     serialise = create_serialisation_pattern(serialisation)
     def store_population_subset(generation: int, population: Sequence[Individual]) -> None:
@@ -0,0 +1,292 @@
+from typing import Callable, Sequence, Optional, Iterable, List, Union, Tuple, Generator, Any, Mapping, Dict
+from array import array
+from math import nan, isnan
+from mmap import mmap, ACCESS_READ
+from os import makedirs
+from os.path import join, exists
+from struct import Struct
+from attr import attrs, attrib
+from pyvolution.types.gene import GeneType, Chromosome, Karyogram
+from pyvolution.types.individual import Individual
+from pyvolution.analysis import PopulationStorage
+
+
+MAGIC = b'PVGB'
+VERSION = 1
+HEADER = Struct('=4sBcHQQQ')
+BinaryBuffer = Union[bytes, bytearray, memoryview, mmap]
+
+
+@attrs
+class GenomeCodec:
+    """
+    Describes how genes are laid out in the gene column: every gene occupies width values of the given
+    array typecode. Without encode/decode genes are expected to be scalars of that type.
+    """
+    typecode: str = attrib(default='d')
+    width: int = attrib(default=1)
+    encode: Optional[Callable[[GeneType], Sequence[Any]]] = attrib(default=None)
+    decode: Optional[Callable[[Sequence[Any]], GeneType]] = attrib(default=None)
+    create_chromosome: Callable[[Iterable[Tuple[int, GeneType]]], Chromosome] = attrib(default=dict)
+
+
+@attrs
+class GenerationColumns:
+    """
+    Typed, zero-copy views on one encoded generation. Chromosome j belongs to the karyogram position
+    positions[j] and holds the genes chromosome_offsets[j]:chromosome_offsets[j+1], individual i owns the
+    chromosomes karyo_offsets[i]:karyo_offsets[i+1]. Columns read from a mapped file keep it open until they
+    are closed, e.g. by a with statement.
+    """
+    ids: memoryview = attrib()
+    generations: memoryview = attrib()
+    fitness: memoryview = attrib()
+    karyo_offsets: memoryview = attrib()
+    positions: memoryview = attrib()
+    chromosome_offsets: memoryview = attrib()
+    genes: memoryview = attrib()
+    width: int = attrib(default=1)
+    source: Optional[mmap] = attrib(default=None, repr=False, eq=False)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __enter__(self) -> 'GenerationColumns':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # the mapping refuses to close while views on it are exported
+        for column in (
+                self.ids, self.generations, self.fitness, self.karyo_offsets, self.positions,
+                self.chromosome_offsets, self.genes
+        ):
+            column.release()
+        if self.source is not None:
+            self.source.close()
+
+
+def default_identify(individual: Individual) -> int:
+    return individual.name['id'] if isinstance(individual.name, Mapping) else individual.name
+
+
+def encode_generation(
+        population: Iterable[Union[Individual, Tuple[Individual, float]]],
+        codec: GenomeCodec=GenomeCodec(),
+        identify: Callable[[Individual], int]=default_identify,
+        genomes: bool=True
+) -> bytes:
+    """
+    Genes of a chromosome are written in iteration order, their positions are assumed to be 0..len-1.
+    Without genomes only the id, generation and fitness columns are filled.
+    :param population:
+    :param codec:
+    :param identify:
+    :param genomes:
+    :return:
+    >>> population = [(Individual({0: ({0: 1.0, 1: 2.0}, {0: 3.0})}, 0, 7), -1.5), Individual({1: ({0: 4.0},)}, 1, 8)]
+    >>> columns = read_generation_columns(encode_generation(population))
+    >>> list(columns.ids), list(columns.fitness)[0], list(columns.positions), list(columns.genes)
+    ([7, 8], -1.5, [0, 0, 1], [1.0, 2.0, 3.0, 4.0])
+    """
+    ids, generations, fitness = array('q'), array('q'), array('d')
+    karyo_offsets, positions, chromosome_offsets = array('q', [0]), array('q'), array('q', [0])
+    genes = array(codec.typecode)
+    for entry in population:
+        individual, score = entry if isinstance(entry, tuple) else (entry, nan)
+        ids.append(identify(individual))
+        generations.append(individual.generation)
+        fitness.append(score)
+        for (position, chromosomes) in (individual.karyogram.items() if genomes else tuple()):
+            for chromosome in chromosomes:
+                positions.append(position)
+                if codec.encode is None:
+                    genes.extend(chromosome.values())
+                else:
+                    genes.extend(value for gene in chromosome.values() for value in codec.encode(gene))
+                chromosome_offsets.append(len(genes) // codec.width)
+        karyo_offsets.append(len(positions))
+
+    header = HEADER.pack(
+        MAGIC, VERSION, codec.typecode.encode('ascii'), codec.width,
+        len(ids), len(positions), len(genes) // codec.width
+    )
+    return b''.join(
+        column.tobytes() if isinstance(column, array) else column
+        for column in (header, ids, generations, fitness, karyo_offsets, positions, chromosome_offsets, genes)
+    )
+
+
+def read_generation_columns(buffer: BinaryBuffer, source: Optional[mmap]=None) -> GenerationColumns:
+    """
+    :param buffer:
+    :param source: mapping the buffer is a view on, closed along with the columns
+    :return:
+    """
+    view = memoryview(buffer)
+    magic, version, typecode, width, individuals, chromosomes, genes = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not a binary generation (version {0}).'.format(VERSION))
+
+    columns = list()
+    offset = HEADER.size
+    for (code, length) in (
+            ('q', individuals), ('q', individuals), ('d', individuals), ('q', individuals + 1),
+            ('q', chromosomes), ('q', chromosomes + 1), (typecode.decode('ascii'), genes * width)
+    ):
+        size = array(code).itemsize * length
+        columns.append(view[offset:offset + size].cast(code))
+        offset += size
+    return GenerationColumns(*columns, width=width, source=source)
+
+
+def decode_karyogram(columns: GenerationColumns, row: int, codec: GenomeCodec=GenomeCodec()) -> Karyogram:
+    """
+    :param columns:
+    :param row:
+    :param codec:
+    :return:
+    >>> codec = GenomeCodec('q', 2, lambda g: (ord(g[0]), g[1]), lambda v: (chr(v[0]), v[1]))
+    >>> columns = read_generation_columns(encode_generation([Individual({0: ({0: ('a', 1)}, {0: ('b', 2)})}, 0, 0)], codec))
+    >>> decode_karyogram(columns, 0, codec)
+    {0: ({0: ('a', 1)}, {0: ('b', 2)})}
+    """
+    karyogram = dict()
+    width = columns.width
+    for chromosome in range(columns.karyo_offsets[row], columns.karyo_offsets[row + 1]):
+        values = columns.genes[
+            columns.chromosome_offsets[chromosome] * width:columns.chromosome_offsets[chromosome + 1] * width
+        ].tolist()
+        if codec.decode is not None:
+            values = [codec.decode(values[i:i + width]) for i in range(0, len(values), width)]
+        karyogram.setdefault(columns.positions[chromosome], []).append(codec.create_chromosome(enumerate(values)))
+    return dict((position, tuple(chromosomes)) for (position, chromosomes) in karyogram.items())
+
+
+def decode_karyograms(columns: GenerationColumns, codec: GenomeCodec=GenomeCodec()) -> List[Karyogram]:
+    """
+    Decodes the karyograms of all rows at once, reading every column into a list first instead of slicing the
+    memoryviews chromosome by chromosome.
+    :param columns:
+    :param codec:
+    :return:
+    >>> population = [Individual({0: ({0: 1.0}, {0: 2.0}), 1: ({0: 3.0, 1: 4.0},)}, 0, i) for i in range(2)]
+    >>> columns = read_generation_columns(encode_generation(population))
+    >>> decode_karyograms(columns) == [decode_karyogram(columns, row) for row in range(2)]
+    True
+    """
+    width, create_chromosome = columns.width, codec.create_chromosome
+    genes = columns.genes.tolist()
+    if codec.decode is not None:
+        genes = [codec.decode(genes[i:i + width]) for i in range(0, len(genes), width)]
+    karyo_offsets, positions = columns.karyo_offsets.tolist(), columns.positions.tolist()
+    chromosome_offsets = columns.chromosome_offsets.tolist()
+    karyograms = list()
+    for row in range(len(columns)):
+        karyogram: Dict[int, List[Chromosome]] = dict()
+        for chromosome in range(karyo_offsets[row], karyo_offsets[row + 1]):
+            karyogram.setdefault(positions[chromosome], []).append(
+                create_chromosome(enumerate(genes[chromosome_offsets[chromosome]:chromosome_offsets[chromosome + 1]]))
+            )
+        karyograms.append(dict((position, tuple(chromosomes)) for (position, chromosomes) in karyogram.items()))
+    return karyograms
+
+
+def decode_individuals(
+        columns: GenerationColumns,
+        codec: GenomeCodec=GenomeCodec(),
+        rows: Optional[Iterable[int]]=None,
+        individual_type: Callable[..., Individual]=Individual
+) -> List[Individual]:
+    """
+    :param columns:
+    :param codec:
+    :param rows:
+    :param individual_type:
+    :return:
+    >>> population = [(Individual({0: ({0: 1.0},)}, 0, i), float(i)) for i in range(3)]
+    >>> decode_individuals(read_generation_columns(encode_generation(population)), rows=[2])
+    [Individual(karyogram={0: ({0: 1.0},)}, generation=0, name=2, meta={'fitness': 2.0})]
+    """
+    rows = range(len(columns)) if rows is None else rows
+    karyograms = decode_karyograms(columns, codec) if rows == range(len(columns)) else None
+    return [
+        individual_type(
+            karyogram=karyograms[row] if karyograms is not None else decode_karyogram(columns, row, codec),
+            generation=columns.generations[row],
+            name=columns.ids[row],
+            meta=dict() if isnan(columns.fitness[row]) else dict(fitness=columns.fitness[row])
+        )
+        for row in rows
+    ]
+
+
+def map_file(path: str) -> mmap:
+    with open(path, 'rb') as src:
+        return mmap(src.fileno(), 0, access=ACCESS_READ)
+
+
+def binary_generation_path(basedir: str, name: str, generation: int) -> str:
+    return join(basedir, '{1}_{0}.bin'.format(generation, name))
+
+
+def create_binary_store(
+        basedir: str,
+        name: str='result',
+        codec: GenomeCodec=GenomeCodec(),
+        identify: Callable[[Individual], int]=default_identify
+) -> PopulationStorage:
+    """
+    Writes every generation handed to the store into its own binary file.
+    :param basedir:
+    :param name:
+    :param codec:
+    :param identify:
+    :return:
+    >>> from tempfile import TemporaryDirectory
+    >>> from pyvolution.types.individual import create_sample_individual
+    >>> population = [(create_sample_individual(2, 2, name=i), -float(i)) for i in range(10)]
+    >>> with TemporaryDirectory() as temp:
+    ...     store = create_binary_store(temp, codec=GenomeCodec('q'))
+    ...     store(0, population)
+    ...     store(1, population[5:])
+    ...     with open_binary_generation(temp, 'result', 1) as columns:
+    ...         fitness = list(columns.fitness)
+    ...     loaded = [list(g) for g in create_binary_loader(temp, codec=GenomeCodec('q'))]
+    >>> fitness
+    [-5.0, -6.0, -7.0, -8.0, -9.0]
+    >>> [len(g) for g in loaded]
+    [10, 5]
+    >>> [list(i.karyogram[1]) for i in loaded[0]] == [i.karyogram[1] for (i, f) in population]
+    True
+    """
+    makedirs(basedir, exist_ok=True)
+
+    def store_generation(generation: int, population: Sequence[Union[Individual, Tuple[Individual, float]]]) -> None:
+        with open(binary_generation_path(basedir, name, generation), 'wb') as out:
+            out.write(encode_generation(population, codec, identify))
+    return store_generation
+
+
+def open_binary_generation(basedir: str, name: str, generation: int) -> GenerationColumns:
+    """
+    Maps the file of a generation, which stays open until the columns are closed.
+    """
+    mapped = map_file(binary_generation_path(basedir, name, generation))
+    return read_generation_columns(mapped, mapped)
+
+
+def create_binary_loader(
+        basedir: str,
+        name: str='result',
+        codec: GenomeCodec=GenomeCodec(),
+        individual_type: Callable[..., Individual]=Individual
+) -> Generator[Sequence[Individual], None, None]:
+    generation = 0
+    while exists(binary_generation_path(basedir, name, generation)):
+        with open_binary_generation(basedir, name, generation) as columns:
+            individuals = decode_individuals(columns, codec, None, individual_type)
+        yield individuals
+        generation += 1
@@ -0,0 +1,135 @@
+from typing import Callable, Sequence, Union, Tuple, Dict, List, Generator, Set
+from pyvolution.types.individual import Individual
+from pyvolution.analysis import PopulationStorage
+from pyvolution.analysis.binary import GenomeCodec, GenerationColumns, decode_individuals, default_identify
+from pyvolution.analysis.runlog import (
+    RunLogIndex, create_run_log_store, read_run_log_index, read_run_log_generation
+)
+
+
+def delta_log_names(name: str) -> Tuple[str, str]:
+    return '{0}_births'.format(name), '{0}_members'.format(name)
+
+
+def create_delta_store(
+        basedir: str,
+        name: str='result',
+        codec: GenomeCodec=GenomeCodec(),
+        identify: Callable[[Individual], int]=default_identify
+) -> PopulationStorage:
+    """
+    Writes the genome of every individual exactly once, in the generation it is first stored, and only
+    records membership and fitness for every later generation it survives.
+    :param basedir:
+    :param name:
+    :param codec:
+    :param identify:
+    :return:
+    >>> from os.path import getsize, join
+    >>> from tempfile import TemporaryDirectory
+    >>> from pyvolution.types.individual import create_sample_individual
+    >>> from pyvolution.analysis.runlog import create_run_log_store
+    >>> individuals = [create_sample_individual(2, 2, name=i, generation=i // 2) for i in range(30)]
+    >>> generations = [[(i, float(i.name)) for i in individuals[2 * g:2 * g + 10]] for g in range(10)]
+    >>> with TemporaryDirectory() as temp:
+    ...     full, delta = create_run_log_store(temp, 'full', GenomeCodec('q')), create_delta_store(temp, 'delta', GenomeCodec('q'))
+    ...     for (generation, population) in enumerate(generations):
+    ...         full(generation, population)
+    ...         delta(generation, population)
+    ...     sizes = getsize(join(temp, 'full.log')), getsize(join(temp, 'delta_births.log')) + getsize(join(temp, 'delta_members.log'))
+    ...     load = create_delta_loader(temp, 'delta', GenomeCodec('q'))
+    ...     fifth = load(5)
+    >>> sizes[1] < sizes[0] / 2
+    True
+    >>> [(i.name, i.meta['fitness']) for i in fifth][:3]
+    [(10, 10.0), (11, 11.0), (12, 12.0)]
+    >>> [list(i.karyogram[0]) for i in fifth] == [i.karyogram[0] for (i, _) in generations[5]]
+    True
+    >>> with TemporaryDirectory() as temp:
+    ...     delta = create_delta_store(temp, 'tail', GenomeCodec('q'))
+    ...     load = create_delta_loader(temp, 'tail', GenomeCodec('q'))
+    ...     delta(0, generations[0])
+    ...     first = load(0)
+    ...     try:
+    ...         load(1)
+    ...     except KeyError:
+    ...         pass
+    ...     delta(1, generations[1])
+    ...     second = load(1)
+    >>> [i.name for i in second] == [i.name for (i, _) in generations[1]]
+    True
+    """
+    births_name, members_name = delta_log_names(name)
+    store_births = create_run_log_store(basedir, births_name, codec, identify)
+    store_members = create_run_log_store(basedir, members_name, codec, identify, genomes=False)
+    written = set()
+
+    def store_generation(generation: int, population: Sequence[Union[Individual, Tuple[Individual, float]]]) -> None:
+        population = tuple(population)
+        newborns = list()
+        for entry in population:
+            identifier = identify(entry[0] if isinstance(entry, tuple) else entry)
+            if identifier not in written:
+                written.add(identifier)
+                newborns.append(entry)
+        store_births(generation, newborns)
+        store_members(generation, population)
+    return store_generation
+
+
+def create_delta_loader(
+        basedir: str,
+        name: str='result',
+        codec: GenomeCodec=GenomeCodec(),
+        individual_type: Callable[..., Individual]=Individual
+) -> Callable[[int], List[Individual]]:
+    """
+    Reconstructs full generations of a delta store on demand. Only the id columns of the birth blocks up to
+    the requested generation are scanned to locate genomes, and only the rows actually needed are decoded.
+    """
+    births_name, members_name = delta_log_names(name)
+    located: Dict[int, Tuple[int, int]] = dict()
+    scanned: Set[int] = set()
+
+    def locate(generation: int, births_index: RunLogIndex) -> None:
+        # only blocks actually read count as scanned, later ones may still be written by a running experiment
+        for block in sorted(births_index):
+            if block > generation:
+                break
+            if block not in scanned:
+                with read_run_log_generation(basedir, births_name, block, births_index) as columns:
+                    for (row, identifier) in enumerate(columns.ids):
+                        located[identifier] = (block, row)
+                scanned.add(block)
+
+    def load_generation(generation: int) -> List[Individual]:
+        births_index = read_run_log_index(basedir, births_name)
+        locate(generation, births_index)
+        with read_run_log_generation(basedir, members_name, generation) as members:
+            members_fitness = list(zip(members.ids.tolist(), members.fitness.tolist()))
+        blocks: Dict[int, GenerationColumns] = dict()
+        individuals = list()
+        try:
+            for (identifier, fitness) in members_fitness:
+                block, row = located[identifier]
+                if block not in blocks:
+                    blocks[block] = read_run_log_generation(basedir, births_name, block, births_index)
+                individual, = decode_individuals(blocks[block], codec, (row,), individual_type)
+                individual.meta['fitness'] = fitness
+                individuals.append(individual)
+        finally:
+            for columns in blocks.values():
+                columns.close()
+        return individuals
+    return load_generation
+
+
+def load_delta_generations(
+        basedir: str,
+        name: str='result',
+        codec: GenomeCodec=GenomeCodec(),
+        individual_type: Callable[..., Individual]=Individual
+) -> Generator[Sequence[Individual], None, None]:
+    load = create_delta_loader(basedir, name, codec, individual_type)
+    for generation in sorted(read_run_log_index(basedir, delta_log_names(name)[1])):
+        yield load(generation)
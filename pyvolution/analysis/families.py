@@ -1,6 +1,9 @@
 from typing import Iterable, Sequence, Callable
+from array import array
+from os.path import exists, getsize
 from pyvolution.types.individual import NameType, Individual
-from pyvolution.analysis import GenerationLoader
+from pyvolution.types.genealogy import Genealogy, build_genealogy
+from pyvolution.analysis import GenerationLoader, PopulationStorage
 
 GenerationIterator = Iterable[Sequence[Individual]]
 LineageFinder = Callable[[GenerationIterator], Iterable[Individual]]
@@ -19,20 +22,89 @@ def build_lineage_finder(predicate: Callable[[Individual], bool]) -> LineageFind
 
 
 def create_children_lineage(parent_id: int) -> Callable[[Individual], bool]:
-    parents = [parent_id]
+    """
+    :param parent_id:
+    :return:
+    >>> is_child = create_children_lineage(0)
+    >>> [is_child(Individual({}, 0, dict(id=i, parents=p))) for (i, p) in [(0, []), (1, [0]), (2, [5]), (3, [1, 2])]]
+    [True, True, False, True]
+    """
+    parents = {parent_id}
     def is_child_in_line(individual: Individual) -> bool:
         if individual.name['id'] in parents:
             return True
 
-        for anchestor in parents:
-            if anchestor in individual.name['parents']:
-                parents.append(individual.name['id'])
-                return True
+        if any(anchestor in parents for anchestor in individual.name['parents']):
+            parents.add(individual.name['id'])
+            return True
         return False
 
     return is_child_in_line
 
 
+def create_genealogy_lineage(genealogy: Genealogy, parent_id: int) -> Callable[[Individual], bool]:
+    """
+    :param genealogy:
+    :param parent_id:
+    :return:
+    >>> genealogy = build_genealogy([(0, 0, 0), (1, 0, 0), (2, 1, 1, 0), (3, 2, 2, 2, 1)])
+    >>> is_child = create_genealogy_lineage(genealogy, 0)
+    >>> [is_child(Individual({}, 0, i)) for i in range(4)]
+    [True, False, True, True]
+    """
+    line = set(genealogy.descendants(parent_id))
+    line.add(parent_id)
+
+    def is_child_in_line(individual: Individual) -> bool:
+        return individual.name in line
+    return is_child_in_line
+
+
+def create_genealogy_store(genealogy: Genealogy, path: str) -> PopulationStorage:
+    """
+    Appends the genealogy rows recorded since the previous call to path, so it can be used as hook of
+    evolve_until and persists the genealogy along with the run.
+    :param genealogy:
+    :param path:
+    :return:
+    >>> from os.path import join
+    >>> from tempfile import TemporaryDirectory
+    >>> genealogy = build_genealogy([(0, 0, 0), (1, 0, 0)])
+    >>> with TemporaryDirectory() as temp:
+    ...     store = create_genealogy_store(genealogy, join(temp, 'genealogy.bin'))
+    ...     store(0, [])
+    ...     genealogy.record(2, 1, (0, 1))
+    ...     store(1, [])
+    ...     loaded = load_genealogy(join(temp, 'genealogy.bin'))
+    >>> len(loaded), list(loaded.parents(2)), loaded.children(1)
+    (3, [0, 1], [2])
+    """
+    written = [0]
+
+    def store_genealogy(_: int, __: Sequence[Individual]) -> None:
+        rows = array('q', (value for row in genealogy.rows_since(written[0]) for value in row))
+        with open(path, 'ab') as out:
+            rows.tofile(out)
+        written[0] = len(genealogy)
+    return store_genealogy
+
+
+def load_genealogy(path: str) -> Genealogy:
+    if not exists(path):
+        return Genealogy()
+    data = array('q')
+    with open(path, 'rb') as src:
+        data.fromfile(src, getsize(path) // data.itemsize)
+
+    def split_rows() -> Iterable[Sequence[int]]:
+        position = 0
+        while position < len(data):
+            end = position + 3 + data[position + 2]
+            yield data[position:end]
+            position = end
+    return build_genealogy(split_rows())
+
+
 
 def load_linage(predicate: Callable[[Individual], bool], data: GenerationIterator) -> Iterable[Individual]:
     """
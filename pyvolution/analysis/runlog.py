@@ -0,0 +1,143 @@
+from typing import Callable, Sequence, Union, Tuple, Dict, Iterable, List, Optional, Generator
+from array import array
+from functools import partial
+from concurrent.futures import Executor
+from os import makedirs
+from os.path import join, exists, getsize
+from time import sleep
+from pyvolution.types.individual import Individual
+from pyvolution.analysis import PopulationStorage
+from pyvolution.analysis.binary import (
+    GenomeCodec, GenerationColumns, encode_generation, read_generation_columns, decode_individuals,
+    default_identify, map_file
+)
+
+RunLogIndex = Dict[int, Tuple[int, int]]
+
+
+def run_log_paths(basedir: str, name: str) -> Tuple[str, str]:
+    return join(basedir, '{0}.log'.format(name)), join(basedir, '{0}.idx'.format(name))
+
+
+def create_run_log_store(
+        basedir: str,
+        name: str='result',
+        codec: GenomeCodec=GenomeCodec(),
+        identify: Callable[[Individual], int]=default_identify,
+        genomes: bool=True
+) -> PopulationStorage:
+    """
+    Appends every generation as binary block to a single log file. The sidecar index receives the
+    (generation, offset, length) entry only after the block is written, so readers never see partial blocks.
+    :param basedir:
+    :param name:
+    :param codec:
+    :param identify:
+    :param genomes:
+    :return:
+    >>> from tempfile import TemporaryDirectory
+    >>> from pyvolution.types.individual import create_sample_individual
+    >>> population = [(create_sample_individual(2, 2, name=i), float(i)) for i in range(6)]
+    >>> with TemporaryDirectory() as temp:
+    ...     store = create_run_log_store(temp, codec=GenomeCodec('q'))
+    ...     for generation in range(4):
+    ...         store(generation, population[generation:])
+    ...     index = read_run_log_index(temp)
+    ...     third = read_run_log_generation(temp, 'result', 2)
+    ...     tail = [(g, len(c)) for (g, c) in tail_run_log(temp, start=1, until=lambda: True)]
+    ...     loaded = load_run_log_range(temp, 'result', range(1, 3), GenomeCodec('q'))
+    >>> sorted(index)
+    [0, 1, 2, 3]
+    >>> list(third.ids), list(third.fitness)
+    ([2, 3, 4, 5], [2.0, 3.0, 4.0, 5.0])
+    >>> tail
+    [(1, 5), (2, 4), (3, 3)]
+    >>> [[i.name for i in generation] for generation in loaded]
+    [[1, 2, 3, 4, 5], [2, 3, 4, 5]]
+    """
+    makedirs(basedir, exist_ok=True)
+    log_path, index_path = run_log_paths(basedir, name)
+
+    def store_generation(generation: int, population: Sequence[Union[Individual, Tuple[Individual, float]]]) -> None:
+        block = encode_generation(population, codec, identify, genomes)
+        with open(log_path, 'ab') as out:
+            offset = out.tell()
+            out.write(block)
+            out.write(bytes(-len(block) % 8))
+        with open(index_path, 'ab') as out:
+            array('q', (generation, offset, len(block))).tofile(out)
+    return store_generation
+
+
+def read_run_log_index(basedir: str, name: str='result') -> RunLogIndex:
+    _, index_path = run_log_paths(basedir, name)
+    entries = array('q')
+    if exists(index_path):
+        with open(index_path, 'rb') as src:
+            entries.fromfile(src, getsize(index_path) // (3 * entries.itemsize) * 3)
+    return dict(
+        (entries[i], (entries[i + 1], entries[i + 2]))
+        for i in range(0, len(entries), 3)
+    )
+
+
+def read_run_log_generation(
+        basedir: str,
+        name: str,
+        generation: int,
+        index: Optional[RunLogIndex]=None
+) -> GenerationColumns:
+    offset, length = (index if index is not None else read_run_log_index(basedir, name))[generation]
+    log_path, _ = run_log_paths(basedir, name)
+    mapped = map_file(log_path)
+    return read_generation_columns(memoryview(mapped)[offset:offset + length], mapped)
+
+
+def load_run_log_generation(
+        basedir: str,
+        name: str,
+        generation: int,
+        codec: GenomeCodec=GenomeCodec()
+) -> List[Individual]:
+    with read_run_log_generation(basedir, name, generation) as columns:
+        return decode_individuals(columns, codec)
+
+
+def load_run_log_range(
+        basedir: str,
+        name: str,
+        generations: Iterable[int],
+        codec: GenomeCodec=GenomeCodec(),
+        executor: Optional[Executor]=None
+) -> List[List[Individual]]:
+    """
+    Loads several generations, in parallel if an executor is given. Every generation is located through
+    the index, so the workers only touch their own blocks.
+    """
+    load = partial(load_run_log_generation, basedir, name, codec=codec)
+    return list(map(load, generations) if executor is None else executor.map(load, generations))
+
+
+def tail_run_log(
+        basedir: str,
+        name: str='result',
+        start: int=0,
+        poll: float=1.0,
+        until: Callable[[], bool]=lambda: False
+) -> Generator[Tuple[int, GenerationColumns], None, None]:
+    """
+    Yields generations of a (possibly still running) log as soon as their index entry appears and returns
+    once no new generation is available and until() holds. Every yielded generation keeps the log mapped
+    until it is closed.
+    """
+    seen = set()
+    while True:
+        index = read_run_log_index(basedir, name)
+        fresh = sorted(generation for generation in index if generation >= start and generation not in seen)
+        for generation in fresh:
+            seen.add(generation)
+            yield generation, read_run_log_generation(basedir, name, generation, index)
+        if not fresh:
+            if until():
+                return
+            sleep(poll)
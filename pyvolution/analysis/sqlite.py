@@ -0,0 +1,203 @@
+from typing import Callable, Sequence, Union, Tuple, List, Optional, Mapping
+from sqlite3 import Connection, connect
+from pyvolution.types.individual import Individual
+from pyvolution.analysis import PopulationStorage
+from pyvolution.analysis.binary import (
+    GenomeCodec, encode_generation, read_generation_columns, decode_karyogram, default_identify
+)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS individuals (
+    id INTEGER PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    genome BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parents (
+    child INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    parent INTEGER NOT NULL,
+    PRIMARY KEY (child, rank)
+);
+CREATE TABLE IF NOT EXISTS members (
+    generation INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    fitness REAL,
+    PRIMARY KEY (generation, id)
+);
+CREATE INDEX IF NOT EXISTS individuals_generation ON individuals (generation);
+CREATE INDEX IF NOT EXISTS parents_parent ON parents (parent);
+CREATE INDEX IF NOT EXISTS members_fitness ON members (generation, fitness);
+'''
+FitnessDistribution = Tuple[int, int, float, float, float]
+
+
+def default_parents(individual: Individual) -> Sequence[int]:
+    if isinstance(getattr(individual, 'parents', None), tuple):
+        return individual.parents
+    if isinstance(individual.name, Mapping):
+        return individual.name.get('parents', tuple())
+    return tuple()
+
+
+def connect_population_store(path: str) -> Connection:
+    connection = connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def create_sqlite_store(
+        path: str,
+        codec: GenomeCodec=GenomeCodec(),
+        identify: Callable[[Individual], int]=default_identify,
+        parents: Callable[[Individual], Sequence[int]]=default_parents
+) -> Tuple[PopulationStorage, Callable[[], None]]:
+    """
+    Stores every generation in a single transaction. Genomes are written once per individual as binary blob,
+    later generations only add membership rows; survivors are recognised by their id before anything is
+    encoded. Returns the store and a function closing its connection, e.g. a finaliser of evolve_until.
+    :param path:
+    :param codec:
+    :param identify:
+    :param parents:
+    :return:
+    >>> from tempfile import TemporaryDirectory
+    >>> from os.path import join
+    >>> from pyvolution.types.individual import CompactIndividual
+    >>> family = [CompactIndividual({0: ({0: i, 1: -i},)}, i // 4, i, parents=(i - 4, i - 3) if i >= 4 else ()) for i in range(12)]
+    >>> with TemporaryDirectory() as temp:
+    ...     store, close = create_sqlite_store(join(temp, 'run.sqlite'), GenomeCodec('q'))
+    ...     for generation in range(3):
+    ...         store(generation, [(i, float(i.name % 5)) for i in family[4 * generation:4 * generation + 4]])
+    ...     store(3, [(i, 0.0) for i in family[8:]])
+    ...     close()
+    ...     connection = connect_population_store(join(temp, 'run.sqlite'))
+    ...     best = load_best(connection, 1, 2, GenomeCodec('q'))
+    ...     descendants = load_descendants(connection, 0)
+    ...     distribution = load_fitness_distribution(connection)
+    ...     filtered = load_sqlite_generation(connection, 2, GenomeCodec('q'), maximum=2.0)
+    ...     connection.close()
+    >>> [(i.name, i.karyogram, i.meta['fitness']) for i in best]
+    [(4, {0: ({0: 4, 1: -4},)}, 4.0), (7, {0: ({0: 7, 1: -7},)}, 2.0)]
+    >>> descendants
+    [4, 7, 8, 10, 11]
+    >>> distribution[0], distribution[3]
+    ((0, 4, 0.0, 1.5, 3.0), (3, 4, 0.0, 0.0, 0.0))
+    >>> [i.name for i in filtered]
+    [10, 11]
+    """
+    connection = connect_population_store(path)
+    stored = set(identifier for (identifier,) in connection.execute('SELECT id FROM individuals'))
+
+    def store_generation(generation: int, population: Sequence[Union[Individual, Tuple[Individual, float]]]) -> None:
+        ranked = [entry if isinstance(entry, tuple) else (entry, None) for entry in population]
+        newborns = list()
+        for (individual, _) in ranked:
+            identifier = identify(individual)
+            if identifier not in stored:
+                newborns.append((identifier, individual))
+        with connection:
+            connection.executemany(
+                'INSERT OR IGNORE INTO individuals (id, generation, genome) VALUES (?, ?, ?)',
+                (
+                    (identifier, individual.generation, encode_generation((individual,), codec, identify))
+                    for (identifier, individual) in newborns
+                )
+            )
+            connection.executemany(
+                'INSERT OR IGNORE INTO parents (child, rank, parent) VALUES (?, ?, ?)',
+                (
+                    (identifier, rank, parent)
+                    for (identifier, individual) in newborns for (rank, parent) in enumerate(parents(individual))
+                )
+            )
+            connection.executemany(
+                'INSERT OR REPLACE INTO members (generation, id, fitness) VALUES (?, ?, ?)',
+                ((generation, identify(individual), fitness) for (individual, fitness) in ranked)
+            )
+        stored.update(identifier for (identifier, _) in newborns)
+
+    return store_generation, connection.close
+
+
+def decode_rows(
+        rows: Sequence[Tuple[int, int, bytes, Optional[float]]],
+        codec: GenomeCodec,
+        individual_type: Callable[..., Individual]=Individual
+) -> List[Individual]:
+    return [
+        individual_type(
+            karyogram=decode_karyogram(read_generation_columns(genome), 0, codec),
+            generation=generation,
+            name=identifier,
+            meta=dict() if fitness is None else dict(fitness=fitness)
+        )
+        for (identifier, generation, genome, fitness) in rows
+    ]
+
+
+def load_sqlite_generation(
+        connection: Connection,
+        generation: int,
+        codec: GenomeCodec=GenomeCodec(),
+        minimum: Optional[float]=None,
+        maximum: Optional[float]=None,
+        individual_type: Callable[..., Individual]=Individual
+) -> List[Individual]:
+    """
+    Loads the members of a generation with minimum <= fitness < maximum, either bound being optional. The
+    bounds are applied by SQLite before any genome is decoded.
+    :param connection:
+    :param generation:
+    :param codec:
+    :param minimum:
+    :param maximum: exclusive
+    :param individual_type:
+    :return:
+    """
+    return decode_rows(
+        connection.execute(
+            'SELECT i.id, i.generation, i.genome, m.fitness FROM members AS m JOIN individuals AS i ON i.id = m.id '
+            'WHERE m.generation = ? AND (? IS NULL OR m.fitness >= ?) AND (? IS NULL OR m.fitness < ?) '
+            'ORDER BY m.id',
+            (generation, minimum, minimum, maximum, maximum)
+        ).fetchall(),
+        codec,
+        individual_type
+    )
+
+
+def load_best(
+        connection: Connection,
+        generation: int,
+        amount: int,
+        codec: GenomeCodec=GenomeCodec(),
+        individual_type: Callable[..., Individual]=Individual
+) -> List[Individual]:
+    return decode_rows(
+        connection.execute(
+            'SELECT i.id, i.generation, i.genome, m.fitness FROM members AS m JOIN individuals AS i ON i.id = m.id '
+            'WHERE m.generation = ? ORDER BY m.fitness DESC LIMIT ?',
+            (generation, amount)
+        ).fetchall(),
+        codec,
+        individual_type
+    )
+
+
+def load_descendants(connection: Connection, identifier: int) -> List[int]:
+    return [
+        row[0] for row in connection.execute(
+            'WITH RECURSIVE line(id) AS ('
+            '    SELECT child FROM parents WHERE parent = ?'
+            '    UNION SELECT p.child FROM parents AS p JOIN line ON p.parent = line.id'
+            ') SELECT id FROM line ORDER BY id',
+            (identifier,)
+        )
+    ]
+
+
+def load_fitness_distribution(connection: Connection) -> List[FitnessDistribution]:
+    return connection.execute(
+        'SELECT generation, COUNT(*), MIN(fitness), AVG(fitness), MAX(fitness) FROM members '
+        'GROUP BY generation ORDER BY generation'
+    ).fetchall()
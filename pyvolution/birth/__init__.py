@@ -1,26 +1,37 @@
-from typing import Iterator, Sequence
-from pyvolution.types.gene import Crossover, Anomaly
+from typing import Iterator, Sequence, Optional, Callable
+from functools import partial
+from pyvolution.types.gene import Crossover, Anomaly, batch_crossover
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM
 from pyvolution.types.population import (
-    FitnessFunction, create_children_builder, MateSelector,
-    ChildrenSpawn, Population, evaluate_population, top_selector
+    FitnessFunction, create_children_builder, create_batch_children_builder, MateSelector, BatchMateSelector,
+    ChildrenSpawn, Population, evaluate_population, top_selector, top_index_selector
 )
 from pyvolution.types.individual import (
-    Birthing, create_birth_builder, create_sequential_naming,
+    Birthing, create_birth_builder, create_batch_birth_builder, CompactIndividual, create_sequential_naming,
     create_gamete_builder, Mitosis, Selector, select_half,
-    Individual, Naming
+    Individual, Naming, Counter
 )
 
 
-def default_mitosis(selector: Selector=select_half, xover=lambda x: x) -> Mitosis:
-    return create_gamete_builder(selector, xover)
+def default_mitosis(
+        selector: Optional[Selector]=None,
+        xover=lambda x: x,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> Mitosis:
+    return create_gamete_builder(selector if selector else partial(select_half, rng=rng), xover)
 
 
 def default_birth(
         xover: Crossover=lambda x: x,
         anomaly: Anomaly=lambda x: x,
-        naming: Naming=create_sequential_naming()
+        naming: Naming=create_sequential_naming(),
+        rng: RandomSource=GLOBAL_RANDOM,
+        meta_id: Optional[Counter]=None,
+        individual_type: Callable[..., Individual]=Individual
 ) -> Birthing:
-    return create_birth_builder(default_mitosis(), naming, xover=xover, anomaly=anomaly)
+    return create_birth_builder(
+        default_mitosis(rng=rng), naming, xover=xover, anomaly=anomaly, meta_id=meta_id, individual_type=individual_type
+    )
 
 
 def create_fitness_selector(fitness: FitnessFunction, parents: int=2) -> MateSelector:
@@ -41,6 +52,74 @@ def top_individuals_breed(
         fitness: FitnessFunction,
         xover: Crossover=lambda x: x,
         anomaly: Anomaly=lambda x: x,
-        naming: Naming=create_sequential_naming()
+        naming: Naming=create_sequential_naming(),
+        rng: RandomSource=GLOBAL_RANDOM,
+        meta_id: Optional[Counter]=None,
+        individual_type: Callable[..., Individual]=Individual
 ) -> ChildrenSpawn:
-    return create_children_builder(create_fitness_selector(fitness), default_birth(xover, anomaly, naming))
+    """
+    :param fitness:
+    :param xover:
+    :param anomaly:
+    :param naming:
+    :param rng: random source of the gamete selection, e.g. one of spawn_random_streams per worker
+    :param meta_id: source of the meta ids of the children, e.g. a checkpointed Counter
+    :param individual_type: CompactIndividual children keep the names of their parents instead of a meta id
+    :return:
+    >>> from pyvolution.types.rng import spawn_random_streams
+    >>> from pyvolution.types.population import create_sample_population
+    >>> population = create_sample_population(4, rng=spawn_random_streams(5, 1)[0])
+    >>> def offspring(rng):
+    ...     breed = top_individuals_breed(lambda i: 0, naming=create_sequential_naming(), rng=rng)
+    ...     return [child.karyogram for child in breed(population, 3, 1)]
+    >>> offspring(spawn_random_streams(9, 1)[0]) == offspring(spawn_random_streams(9, 1)[0])
+    True
+    """
+    return create_children_builder(
+        create_fitness_selector(fitness), default_birth(xover, anomaly, naming, rng, meta_id, individual_type)
+    )
+
+
+def create_fitness_index_selector(fitness: FitnessFunction, parents: int=2) -> BatchMateSelector:
+    def top_breed(pool: Sequence[Individual], children: int) -> Sequence[Sequence[int]]:
+        order = sorted(range(len(pool)), key=[fitness(individual) for individual in pool].__getitem__, reverse=True)
+        return [tuple(order[index] for index in row) for row in top_index_selector(parents, order, children)]
+    return top_breed
+
+
+def top_individuals_batch_breed(
+        fitness: FitnessFunction,
+        xover: Crossover=lambda x: x,
+        anomaly: Anomaly=lambda x: x,
+        naming: Naming=create_sequential_naming(),
+        rng: RandomSource=GLOBAL_RANDOM,
+        meta_id: Optional[Counter]=None,
+        individual_type: Callable[..., Individual]=Individual
+) -> ChildrenSpawn:
+    """
+    Same breeding as top_individuals_breed, but all children of a generation are born in one batch.
+    :param fitness:
+    :param xover:
+    :param anomaly:
+    :param naming:
+    :param rng:
+    :param meta_id:
+    :param individual_type:
+    :return:
+    >>> from pyvolution.types.population import create_sample_population
+    >>> population = create_sample_population(4)
+    >>> for (i, individual) in enumerate(population):
+    ...     individual.name = i
+    >>> breed = top_individuals_batch_breed(
+    ...     lambda i: i.name, naming=create_sequential_naming(lambda x: x + 4), individual_type=CompactIndividual
+    ... )
+    >>> [(child.name, child.parents) for child in breed(population, 3, 1)]
+    [(4, (3, 2)), (5, (1, 0)), (6, (3, 2))]
+    """
+    return create_batch_children_builder(
+        create_fitness_index_selector(fitness),
+        create_batch_birth_builder(
+            naming, xover=batch_crossover(xover), anomaly=anomaly, rng=rng, meta_id=meta_id,
+            individual_type=individual_type
+        )
+    )
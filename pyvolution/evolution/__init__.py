@@ -1,9 +1,10 @@
-from typing import Iterable, Callable, Sequence
+from typing import Iterable, Callable, Sequence, Optional
 from itertools import chain
-from pyvolution.types.individual import Individual
+from functools import partial
+from pyvolution.types.individual import Individual, Counter
 from pyvolution.types.population import (
     ChildrenSpawn, Survival, GrowthDetermination,
-    FitnessFunction, evaluate_population, RankedPopulation,
+    FitnessFunction, evaluate_population, RankedPopulation, Population,
     keep_population_size
 )
 from pyvolution.survival import keep_best_halve
@@ -12,20 +13,24 @@ from pyvolution.mutation import Mutator, mutate
 
 Evolution = Callable[[Iterable[Individual], int], RankedPopulation]
 EvolutionStopCriteria = Callable[[RankedPopulation], bool]
+GenerationHook = Callable[[int, RankedPopulation], None]
+PopulationEvaluation = Callable[[Population], RankedPopulation]
 
 
-def create_step_stop_criteria(steps: int) -> EvolutionStopCriteria:
+def create_step_stop_criteria(steps: int, counter: Optional[Counter]=None) -> EvolutionStopCriteria:
     """
     :param steps:
+    :param counter:
     :return:
     >>> create_step_stop_criteria(10)(None)
+    False
+    >>> until = create_step_stop_criteria(1)
+    >>> until(None), until(None)
+    (False, True)
     """
-    rounds = [steps, steps]
+    rounds = counter if counter is not None else Counter()
     def unitl_number_of_steps(_: RankedPopulation) -> bool:
-        if rounds[0]:
-            rounds[0] -= 1
-            return False
-        return True
+        return next(rounds) >= steps
     return unitl_number_of_steps
 
 
@@ -35,13 +40,14 @@ def build_evolution_model(
         birth: ChildrenSpawn,
         growth: GrowthDetermination=keep_population_size(10),
         survival: Survival=keep_best_halve,
-
+        evaluation: Optional[PopulationEvaluation]=None
 ):
     """
     :param growth:
     :param birth:
     :param survival:
     :param fitness:
+    :param evaluation: evaluates a whole population, e.g. in parallel; evaluate_population with fitness by default
     :return:
     >>> from string import ascii_letters
     >>> from random import choice, randint
@@ -94,6 +100,8 @@ def build_evolution_model(
     True
     """
 
+    evaluate = evaluation if evaluation else partial(evaluate_population, fitness)
+
     def evolve(
             population: Iterable[Individual],
             generation: int,
@@ -101,13 +109,12 @@ def build_evolution_model(
             mutator: Mutator=lambda x: x
     ) -> Iterable[RankedPopulation]:
         if not steps:
-            return evaluate_population(fitness, population)
+            return evaluate(population)
 
-        survivors = survival(evaluate_population(fitness, population))
+        survivors = survival(evaluate(population))
         next_gen = (
             chain(
-                evaluate_population(
-                    fitness,
+                evaluate(
                     (
                         mutate(mutator, child)
                         for child in birth((i for (i, ranking) in survivors), growth(survivors), generation+1)
@@ -133,14 +140,28 @@ def evolve_until(
         population: Iterable[Individual],
         until: EvolutionStopCriteria,
         generation: int=0,
-        hooks: Sequence[Callable[[int, RankedPopulation], None]]=tuple()
+        hooks: Sequence[GenerationHook]=tuple(),
+        finalisers: Sequence[Callable[[], None]]=tuple()
 ) -> RankedPopulation:
+    """
+    :param evolve:
+    :param population:
+    :param until:
+    :param generation:
+    :param hooks:
+    :param finalisers: called once the evolution stops, e.g. to flush background hooks
+    :return:
+    """
     next_population = tuple(population)
-    while True:
-        next_population = tuple(evolve(next_population, generation))
-        for hook in hooks:
-            hook(generation, next_population)
-        if until(next_population):
-            return next_population
-        next_population = (i for (i, _) in next_population)
-        generation += 1
+    try:
+        while True:
+            next_population = tuple(evolve(next_population, generation))
+            for hook in hooks:
+                hook(generation, next_population)
+            if until(next_population):
+                return next_population
+            next_population = (i for (i, _) in next_population)
+            generation += 1
+    finally:
+        for finalise in finalisers:
+            finalise()
@@ -0,0 +1,133 @@
+from typing import Callable, Iterable, Sequence, List, Union, Awaitable, Any
+from asyncio import Semaphore, gather
+from inspect import isawaitable
+from pyvolution.types.individual import Individual
+from pyvolution.types.population import (
+    Fitness, ChildrenSpawn, GrowthDetermination, Survival, Population, RankedPopulation, keep_population_size
+)
+from pyvolution.survival import keep_best_halve
+from pyvolution.mutation import Mutator, mutate
+
+AsyncFitnessFunction = Callable[[Individual], Union[Fitness, Awaitable[Fitness]]]
+AsyncPopulationEvaluation = Callable[[Population], Awaitable[RankedPopulation]]
+AsyncEvolution = Callable[[Iterable[Individual], int], Awaitable[RankedPopulation]]
+
+
+async def resolve(value: Any) -> Any:
+    return await value if isawaitable(value) else value
+
+
+def create_async_evaluation(fitness: AsyncFitnessFunction, concurrency: int=100) -> AsyncPopulationEvaluation:
+    """
+    Evaluates a population with at most concurrency evaluations in flight; fitness may be a coroutine function
+    or a plain function.
+    :param fitness:
+    :param concurrency:
+    :return:
+    >>> from asyncio import run, sleep
+    >>> async def fitness(individual):
+    ...     await sleep(0.01)
+    ...     return float(individual)
+    >>> # noinspection PyTypeChecker
+    >>> run(create_async_evaluation(fitness, 3)(range(5)))
+    [(0, 0.0), (1, 1.0), (2, 2.0), (3, 3.0), (4, 4.0)]
+    """
+    async def evaluate(population: Population) -> RankedPopulation:
+        limit = Semaphore(concurrency)
+
+        async def rank(individual: Individual) -> Fitness:
+            async with limit:
+                return await resolve(fitness(individual))
+
+        members = list(population)
+        return list(zip(members, await gather(*map(rank, members))))
+    return evaluate
+
+
+def build_async_evolution_model(
+        fitness: AsyncFitnessFunction,
+        birth: ChildrenSpawn,
+        growth: GrowthDetermination=keep_population_size(10),
+        survival: Survival=keep_best_halve,
+        concurrency: int=100
+) -> AsyncEvolution:
+    """
+    Async counterpart of build_evolution_model for fitness functions waiting on simulators, subprocesses or
+    services: all evaluations of a generation run concurrently within the limit.
+    :param fitness:
+    :param birth:
+    :param growth:
+    :param survival:
+    :param concurrency:
+    :return:
+    >>> from asyncio import run, sleep
+    >>> from pyvolution.birth import top_individuals_breed
+    >>> from pyvolution.evolution import create_step_stop_criteria
+    >>> from pyvolution.types.population import create_sample_population
+    >>> def score(individual):
+    ...     return float(sum(g for cs in individual.karyogram.values() for c in cs for g in c.values()))
+    >>> flight = dict(current=0, peak=0)
+    >>> async def fitness(individual):
+    ...     flight['current'] += 1
+    ...     flight['peak'] = max(flight['peak'], flight['current'])
+    ...     await sleep(0.001)
+    ...     flight['current'] -= 1
+    ...     return score(individual)
+    >>> evolve = build_async_evolution_model(fitness, top_individuals_breed(score), keep_population_size(100), concurrency=20)
+    >>> async def hook(generation, population):
+    ...     await sleep(0)
+    >>> ranked = run(evolve_until_async(evolve, create_sample_population(100), create_step_stop_criteria(3), hooks=[hook]))
+    >>> len(ranked), 1 < flight['peak'] <= 20
+    (100, True)
+    """
+    evaluate = create_async_evaluation(fitness, concurrency)
+
+    async def evolve(
+            population: Iterable[Individual],
+            generation: int,
+            steps: int=1,
+            mutator: Mutator=lambda x: x
+    ) -> RankedPopulation:
+        ranked = await evaluate(population)
+        for step in range(steps):
+            survivors = list(survival(ranked))
+            children = [
+                mutate(mutator, child)
+                for child in birth((i for (i, _) in survivors), growth(survivors), generation + step + 1)
+            ]
+            ranked = await evaluate(children) + survivors
+        return ranked
+    return evolve
+
+
+async def evolve_until_async(
+        evolve: AsyncEvolution,
+        population: Iterable[Individual],
+        until: Callable[[RankedPopulation], Union[bool, Awaitable[bool]]],
+        generation: int=0,
+        hooks: Sequence[Callable[[int, RankedPopulation], Any]]=tuple(),
+        finalisers: Sequence[Callable[[], Any]]=tuple()
+) -> RankedPopulation:
+    """
+    Async counterpart of evolve_until; stop criteria, hooks and finalisers may be plain or coroutine functions.
+    :param evolve:
+    :param population:
+    :param until:
+    :param generation:
+    :param hooks:
+    :param finalisers:
+    :return:
+    """
+    next_population: List[Individual] = list(population)
+    try:
+        while True:
+            ranked = await evolve(next_population, generation)
+            for hook in hooks:
+                await resolve(hook(generation, ranked))
+            if await resolve(until(ranked)):
+                return ranked
+            next_population = [individual for (individual, _) in ranked]
+            generation += 1
+    finally:
+        for finalise in finalisers:
+            await resolve(finalise())
@@ -0,0 +1,101 @@
+from typing import Callable, Tuple, Deque, Optional, List
+from collections import deque
+from threading import Thread, Condition
+from pyvolution.types.population import RankedPopulation
+from pyvolution.evolution import GenerationHook
+
+BLOCK = 'block'
+DROP = 'drop'
+COALESCE = 'coalesce'
+
+
+def create_background_hook(
+        hook: GenerationHook,
+        capacity: int=2,
+        policy: str=BLOCK,
+        snapshot: Callable[[RankedPopulation], RankedPopulation]=tuple
+) -> Tuple[GenerationHook, Callable[[], None]]:
+    """
+    Runs hook on a background thread. Generations are handed over through a queue of the given capacity;
+    once it is full the policy decides whether the evolution waits (block), the new generation is skipped
+    (drop) or replaces the newest pending one (coalesce). The returned flush waits until all pending
+    generations are handled, stops the thread and re-raises errors of the hook.
+    :param hook:
+    :param capacity:
+    :param policy:
+    :param snapshot:
+    :return:
+    >>> from time import sleep
+    >>> seen = []
+    >>> def slow_store(generation, population):
+    ...     sleep(0.01)
+    ...     seen.append((generation, len(population)))
+    >>> background, flush = create_background_hook(slow_store)
+    >>> for generation in range(5):
+    ...     background(generation, [(None, 0.0)] * generation)
+    >>> flush()
+    >>> seen
+    [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4)]
+    >>> seen.clear()
+    >>> background, flush = create_background_hook(slow_store, 1, COALESCE)
+    >>> for generation in range(20):
+    ...     background(generation, [])
+    >>> flush()
+    >>> len(seen) < 20, seen[-1]
+    (True, (19, 0))
+    """
+    if policy not in (BLOCK, DROP, COALESCE):
+        raise ValueError('Unknown back-pressure policy {0}.'.format(policy))
+    pending: Deque[Tuple[int, RankedPopulation]] = deque()
+    condition = Condition()
+    state = dict(running=True)
+    errors: List[BaseException] = list()
+    worker: List[Optional[Thread]] = [None]
+
+    def work() -> None:
+        while True:
+            with condition:
+                while not pending and state['running']:
+                    condition.wait()
+                if not pending:
+                    return
+                generation, population = pending.popleft()
+                condition.notify_all()
+            try:
+                hook(generation, population)
+            except BaseException as error:
+                errors.append(error)
+
+    def raise_errors() -> None:
+        if errors:
+            raise errors.pop(0)
+
+    def background_hook(generation: int, population: RankedPopulation) -> None:
+        raise_errors()
+        item = (generation, snapshot(population))
+        with condition:
+            if worker[0] is None:
+                state['running'] = True
+                worker[0] = Thread(target=work, name='pyvolution-background-hook', daemon=True)
+                worker[0].start()
+            if len(pending) >= capacity:
+                if policy == DROP:
+                    return
+                if policy == COALESCE:
+                    pending[-1] = item
+                    return
+                while len(pending) >= capacity:
+                    condition.wait()
+            pending.append(item)
+            condition.notify_all()
+
+    def flush() -> None:
+        with condition:
+            state['running'] = False
+            condition.notify_all()
+            thread, worker[0] = worker[0], None
+        if thread is not None:
+            thread.join()
+        raise_errors()
+
+    return background_hook, flush
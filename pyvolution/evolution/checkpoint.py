@@ -0,0 +1,244 @@
+from typing import Mapping, Dict, Any, Optional, Sequence, Callable, Iterator
+from contextlib import contextmanager
+from itertools import count
+from os import replace
+from pickle import dump, load, HIGHEST_PROTOCOL
+import gc
+import random
+from attr import attrs, attrib, Factory
+from pyvolution.types.individual import Individual, Counter
+from pyvolution.types.population import RankedPopulation
+from pyvolution.analysis.binary import GenomeCodec, encode_generation, read_generation_columns, decode_karyograms
+from pyvolution.evolution import Evolution, EvolutionStopCriteria, GenerationHook, evolve_until
+
+RandomSources = Mapping[str, Any]
+
+
+def default_random_sources() -> RandomSources:
+    return dict(random=random)
+
+
+@attrs
+class Checkpoint:
+    generation: int = attrib()
+    population: RankedPopulation = attrib()
+    random_states: Dict[str, Any] = attrib(default=Factory(dict))
+    counters: Dict[str, int] = attrib(default=Factory(dict))
+
+
+def capture_checkpoint(
+        generation: int,
+        population: RankedPopulation,
+        counters: Mapping[str, Counter]=None,
+        random_sources: Optional[RandomSources]=None
+) -> Checkpoint:
+    """
+    :param generation:
+    :param population:
+    :param counters: naming, birth and stop criteria counters by name
+    :param random_sources: objects offering getstate/setstate, the random module by default
+    :return:
+    """
+    sources = random_sources if random_sources is not None else default_random_sources()
+    return Checkpoint(
+        generation,
+        tuple(population),
+        dict((name, source.getstate()) for (name, source) in sources.items()),
+        dict((name, counter.value) for (name, counter) in (counters or dict()).items())
+    )
+
+
+def restore_checkpoint(
+        checkpoint: Checkpoint,
+        counters: Mapping[str, Counter]=None,
+        random_sources: Optional[RandomSources]=None
+) -> None:
+    sources = random_sources if random_sources is not None else default_random_sources()
+    for (name, source) in sources.items():
+        source.setstate(checkpoint.random_states[name])
+    for (name, counter) in (counters or dict()).items():
+        counter.value = checkpoint.counters[name]
+
+
+@contextmanager
+def paused_garbage_collection() -> Iterator[None]:
+    """
+    Rebuilding a population allocates millions of containers, each allocation burst triggering collections
+    that find nothing to free.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def save_checkpoint(checkpoint: Checkpoint, path: str, codec: Optional[GenomeCodec]=None) -> None:
+    """
+    Pickles the checkpoint or, given a codec, writes a columnar snapshot: the pickled generation, random
+    states, counters, names and meta followed by the population as a binary generation block. Snapshots are
+    smaller than the pickle but slower to load, since every chromosome is rebuilt from the gene column. They
+    only keep the genes the codec encodes, karyograms come back as tuples of codec.create_chromosome
+    chromosomes, and fitness values have to be floats.
+    :param checkpoint:
+    :param path:
+    :param codec:
+    :return:
+    >>> from os.path import join
+    >>> from tempfile import TemporaryDirectory
+    >>> population = [(Individual({0: ({0: 1, 1: 2}, {0: 3, 1: 4})}, 2, 'a', dict(id=5)), -1.0)]
+    >>> with TemporaryDirectory() as temp:
+    ...     save_checkpoint(Checkpoint(2, population, counters=dict(ids=6)), join(temp, 'run.ckpt'), GenomeCodec('q'))
+    ...     loaded = load_checkpoint(join(temp, 'run.ckpt'), GenomeCodec('q'))
+    >>> list(loaded.population) == population, loaded.counters
+    (True, {'ids': 6})
+    """
+    with open(path + '.tmp', 'wb') as out:
+        if codec is None:
+            dump(checkpoint, out, protocol=HIGHEST_PROTOCOL)
+        else:
+            individuals = [individual for (individual, _) in checkpoint.population]
+            rows = count()
+            dump(
+                (
+                    checkpoint.generation, checkpoint.random_states, checkpoint.counters,
+                    [individual.name for individual in individuals], [individual.meta for individual in individuals]
+                ),
+                out,
+                protocol=HIGHEST_PROTOCOL
+            )
+            out.write(encode_generation(checkpoint.population, codec, lambda _: next(rows)))
+    replace(path + '.tmp', path)
+
+
+def load_checkpoint(
+        path: str,
+        codec: Optional[GenomeCodec]=None,
+        individual_type: Callable[..., Individual]=Individual
+) -> Checkpoint:
+    """
+    Columnar snapshots are decoded in bulk by decode_karyograms into individual_type individuals, built from
+    karyogram, generation, name and meta. Nearly all of the loading time goes into creating the chromosomes:
+    for 100000 individuals of ten chromosomes with ten genes each, a GenomeCodec('b') snapshot takes 1.0 s to
+    save and 1.9 s to load against 1.1 s and 1.5 s for the pickle, of which creating the 1000000 chromosome
+    dicts alone takes 1.3 s. The snapshot is 30 MB instead of 52 MB.
+    :param path:
+    :param codec: the codec the checkpoint was saved with, if any
+    :param individual_type:
+    :return:
+    >>> from os.path import join
+    >>> from tempfile import TemporaryDirectory
+    >>> from pyvolution.types.individual import CompactIndividual
+    >>> population = [(CompactIndividual({0: ({0: 1, 1: 2},)}, 2, 7, dict(origin='lab')), 0.5)]
+    >>> with TemporaryDirectory() as temp:
+    ...     save_checkpoint(Checkpoint(2, population), join(temp, 'run.ckpt'), GenomeCodec('q'))
+    ...     loaded = load_checkpoint(join(temp, 'run.ckpt'), GenomeCodec('q'), CompactIndividual)
+    >>> loaded.population
+    ((CompactIndividual(karyogram={0: ({0: 1, 1: 2},)}, generation=2, name=7, parents=(), fitness=None), 0.5),)
+    >>> loaded.population[0][0].meta
+    {'origin': 'lab'}
+    """
+    with open(path, 'rb') as src, paused_garbage_collection():
+        if codec is None:
+            return load(src)
+        generation, random_states, counters, names, metas = load(src)
+        columns = read_generation_columns(src.read())
+        population = tuple(
+            (individual_type(karyogram=karyogram, generation=born, name=name, meta=meta), fitness)
+            for (karyogram, born, name, meta, fitness) in zip(
+                decode_karyograms(columns, codec), columns.generations.tolist(), names, metas,
+                columns.fitness.tolist()
+            )
+        )
+        return Checkpoint(generation, population, random_states, counters)
+
+
+def create_checkpoint_hook(
+        path: str,
+        counters: Mapping[str, Counter]=None,
+        random_sources: Optional[RandomSources]=None,
+        every: int=1,
+        codec: Optional[GenomeCodec]=None
+) -> GenerationHook:
+    """
+    Writes a checkpoint every given number of generations. Since it captures the random state, the hook has
+    to be the last hook of evolve_until; hooks after it would not be repeated by a resumed run.
+    :param path:
+    :param counters:
+    :param random_sources:
+    :param every:
+    :param codec: writes columnar snapshots, see save_checkpoint
+    :return:
+    """
+    def store_checkpoint(generation: int, population: RankedPopulation) -> None:
+        if generation % every == 0:
+            save_checkpoint(capture_checkpoint(generation, population, counters, random_sources), path, codec)
+    return store_checkpoint
+
+
+def resume_evolution(
+        evolve: Evolution,
+        checkpoint: Checkpoint,
+        until: EvolutionStopCriteria,
+        counters: Mapping[str, Counter]=None,
+        random_sources: Optional[RandomSources]=None,
+        hooks: Sequence[GenerationHook]=tuple(),
+        finalisers: Sequence[Callable[[], None]]=tuple()
+) -> RankedPopulation:
+    """
+    Continues an evolution exactly where the checkpoint was taken. evolve, until and the counters have to be
+    built the same way as in the interrupted run.
+    :param evolve:
+    :param checkpoint:
+    :param until:
+    :param counters:
+    :param random_sources:
+    :param hooks:
+    :param finalisers:
+    :return:
+    >>> from os.path import join
+    >>> from random import seed
+    >>> from tempfile import TemporaryDirectory
+    >>> from pyvolution.birth import top_individuals_breed
+    >>> from pyvolution.evolution import build_evolution_model, create_step_stop_criteria
+    >>> from pyvolution.types.population import create_sample_population, keep_population_size
+    >>> from pyvolution.types.individual import create_sequential_naming
+    >>> def fitness(individual):
+    ...     return -abs(sum(g for cs in individual.karyogram.values() for c in cs for g in c.values()) - 40)
+    >>> def build():
+    ...     counters = dict(names=Counter(100), ids=Counter(), steps=Counter())
+    ...     breed = top_individuals_breed(
+    ...         fitness, naming=create_sequential_naming(counter=counters['names']), meta_id=counters['ids']
+    ...     )
+    ...     evolve = build_evolution_model(fitness, breed, keep_population_size(10))
+    ...     return evolve, create_step_stop_criteria(6, counters['steps']), counters
+    >>> seed(3)
+    >>> population = create_sample_population(10)
+    >>> for (i, individual) in enumerate(population):
+    ...     individual.name = i
+    >>> evolve, until, counters = build()
+    >>> with TemporaryDirectory() as temp:
+    ...     hook = create_checkpoint_hook(join(temp, 'run.ckpt'), counters, every=4)
+    ...     uninterrupted = evolve_until(evolve, population, until, hooks=[hook])
+    ...     checkpoint = load_checkpoint(join(temp, 'run.ckpt'))
+    ...     evolve, until, counters = build()
+    ...     seed(0)
+    ...     resumed = resume_evolution(evolve, checkpoint, until, counters)
+    >>> checkpoint.generation, counters['steps'].value > checkpoint.counters['steps']
+    (4, True)
+    >>> resumed == uninterrupted, resumed[0][0].meta['id'] >= checkpoint.counters['ids']
+    (True, True)
+    """
+    restore_checkpoint(checkpoint, counters, random_sources)
+    if until(checkpoint.population):
+        return checkpoint.population
+    return evolve_until(
+        evolve,
+        (individual for (individual, _) in checkpoint.population),
+        until,
+        checkpoint.generation + 1,
+        hooks,
+        finalisers
+    )
@@ -0,0 +1,212 @@
+from typing import Callable, Sequence, List, Tuple, Optional, Any
+from math import fsum, nan
+from multiprocessing import get_context
+from queue import Empty
+from traceback import format_exc
+from attr import attrs, attrib
+from pyvolution.types.individual import Individual
+from pyvolution.types.population import RankedPopulation
+from pyvolution.types.rng import GLOBAL_RANDOM, derive_seed
+from pyvolution.survival import select_best
+from pyvolution.evolution import Evolution
+
+IslandFactory = Callable[[int], Tuple[Sequence[Individual], Evolution]]
+Topology = Callable[[int], List[List[int]]]
+
+
+@attrs
+class IslandStats:
+    island: int = attrib()
+    generation: int = attrib()
+    best: float = attrib()
+    mean: float = attrib()
+    size: int = attrib()
+
+
+@attrs
+class IslandResult:
+    populations: List[RankedPopulation] = attrib()
+    stats: List[IslandStats] = attrib()
+
+    def best(self) -> Tuple[Individual, float]:
+        return max((entry for population in self.populations for entry in population), key=lambda x: x[1])
+
+
+def ring_topology(islands: int) -> List[List[int]]:
+    """
+    :param islands:
+    :return:
+    >>> ring_topology(3)
+    [[1], [2], [0]]
+    """
+    return [[(island + 1) % islands] if islands > 1 else [] for island in range(islands)]
+
+
+def all_to_all_topology(islands: int) -> List[List[int]]:
+    """
+    :param islands:
+    :return:
+    >>> all_to_all_topology(3)
+    [[1, 2], [0, 2], [0, 1]]
+    """
+    return [[target for target in range(islands) if target != island] for island in range(islands)]
+
+
+def describe_generation(island: int, generation: int, ranked: RankedPopulation) -> IslandStats:
+    """
+    :param island:
+    :param generation:
+    :param ranked:
+    :return:
+    >>> describe_generation(0, 1, [(None, 1.0), (None, 3.0)])
+    IslandStats(island=0, generation=1, best=3.0, mean=2.0, size=2)
+    >>> describe_generation(0, 1, [])
+    IslandStats(island=0, generation=1, best=nan, mean=nan, size=0)
+    """
+    fitness = [value for (_, value) in ranked]
+    if not fitness:
+        return IslandStats(island, generation, nan, nan, 0)
+    return IslandStats(island, generation, max(fitness), fsum(fitness) / len(fitness), len(fitness))
+
+
+def run_island(
+        index: int,
+        factory: IslandFactory,
+        epochs: int,
+        interval: int,
+        migrants: int,
+        inbox: Any,
+        outboxes: Sequence[Any],
+        sources: int,
+        results: Any,
+        seed: Optional[int]
+) -> None:
+    try:
+        GLOBAL_RANDOM.seed(derive_seed(seed, index) if seed is not None else None)
+        population, evolve = factory(index)
+        population, ranked, stats, generation = list(population), tuple(), list(), 0
+        for epoch in range(epochs):
+            for _ in range(interval):
+                ranked = tuple(evolve(population, generation))
+                population = [individual for (individual, _) in ranked]
+                stats.append(describe_generation(index, generation, ranked))
+                generation += 1
+            if epoch == epochs - 1:
+                break
+            emigrants = [individual for (individual, _) in select_best(ranked, migrants)]
+            for outbox in outboxes:
+                outbox.put(emigrants)
+            immigrants = [individual for _ in range(sources) for individual in inbox.get()]
+            population = [
+                individual for (individual, _) in select_best(ranked, max(len(ranked) - len(immigrants), 0))
+            ] + immigrants
+        results.put((index, ranked, stats, None))
+    except BaseException:
+        results.put((index, None, None, format_exc()))
+
+
+def run_islands(
+        factory: IslandFactory,
+        islands: int,
+        epochs: int,
+        interval: int=10,
+        migrants: int=1,
+        topology: Topology=ring_topology,
+        seed: Optional[int]=None,
+        context: Optional[str]=None,
+        poll: float=1.0
+) -> IslandResult:
+    """
+    Runs one evolution per island in its own process for epochs * interval generations. After every epoch
+    but the last each island sends its migrants best members to the islands the topology connects it with
+    and replaces its worst members by the migrants it receives. Every island builds its population and
+    evolution with factory(index) inside its process; the global random source of island i is seeded with
+    derive_seed(seed, i), or from system entropy without a seed. An island failing with an exception or its
+    process exiting without a result raises a RuntimeError and terminates the other islands.
+    :param factory:
+    :param islands:
+    :param epochs:
+    :param interval: generations between migrations
+    :param migrants:
+    :param topology:
+    :param seed:
+    :param context: multiprocessing start method, the factory has to be picklable unless it is 'fork'
+    :param poll: seconds between checks whether the island processes are still alive
+    :return:
+    >>> from pyvolution.birth import top_individuals_breed
+    >>> from pyvolution.evolution import build_evolution_model
+    >>> from pyvolution.types.individual import create_sequential_naming
+    >>> from pyvolution.types.population import create_sample_population
+    >>> def fitness(individual):
+    ...     return float(sum(g for cs in individual.karyogram.values() for c in cs for g in c.values()))
+    >>> def factory(index):
+    ...     breed = top_individuals_breed(fitness, naming=create_sequential_naming(lambda x: (index, x)))
+    ...     return create_sample_population(10), build_evolution_model(fitness, breed)
+    >>> result = run_islands(factory, 3, epochs=3, interval=4, migrants=2, seed=1, context='fork')
+    >>> [len(population) for population in result.populations], len(result.stats)
+    ([10, 10, 10], 36)
+    >>> result.best()[1] >= max(s.best for s in result.stats if s.generation == 0)
+    True
+    >>> run_islands(factory, 2, epochs=0, context='fork')
+    IslandResult(populations=[(), ()], stats=[])
+    >>> def crashing(index):
+    ...     if index == 1:
+    ...         import os
+    ...         os._exit(3)
+    ...     return factory(index)
+    >>> try:
+    ...     run_islands(crashing, 2, epochs=1, context='fork', poll=0.1)
+    ... except RuntimeError as error:
+    ...     print(error)
+    Island 1 exited with code 3 before reporting a result.
+    """
+    mp = get_context(context)
+    inboxes = [mp.Queue() for _ in range(islands)]
+    results = mp.Queue()
+    targets = topology(islands)
+    sources = [sum(island in island_targets for island_targets in targets) for island in range(islands)]
+    processes = [
+        mp.Process(
+            target=run_island,
+            args=(
+                index, factory, epochs, interval, migrants, inboxes[index],
+                [inboxes[target] for target in targets[index]], sources[index], results, seed
+            ),
+            daemon=True
+        )
+        for index in range(islands)
+    ]
+    populations, stats = [None] * islands, list()
+    pending, exited = set(range(islands)), set()
+    try:
+        for process in processes:
+            process.start()
+        while pending:
+            try:
+                index, ranked, island_stats, error = results.get(timeout=poll)
+            except Empty:
+                # an island may exit right after its result was queued, so it is only lost once it stayed
+                # silent for a whole poll after exiting
+                lost = sorted(exited)
+                if lost:
+                    raise RuntimeError(
+                        'Island {0} exited with code {1} before reporting a result.'.format(
+                            lost[0], processes[lost[0]].exitcode
+                        )
+                    )
+                exited = set(index for index in pending if processes[index].exitcode is not None)
+                continue
+            if error is not None:
+                raise RuntimeError('Island {0} failed:\n{1}'.format(index, error))
+            populations[index] = ranked
+            stats.extend(island_stats)
+            pending.discard(index)
+            exited.discard(index)
+    finally:
+        for (index, process) in enumerate(processes):
+            if process.pid is None:
+                continue
+            if populations[index] is None:
+                process.terminate()
+            process.join()
+    return IslandResult(populations, sorted(stats, key=lambda s: (s.generation, s.island)))
@@ -0,0 +1,130 @@
+from typing import Iterable, List, Tuple, Callable
+from concurrent.futures import Executor, Future
+from queue import SimpleQueue, Empty
+from attr import attrs, attrib, Factory
+from pyvolution.types.individual import Individual
+from pyvolution.types.population import (
+    Fitness, FitnessFunction, ChildrenSpawn, GrowthDetermination, Survival, RankedPopulation, keep_population_size
+)
+from pyvolution.survival import keep_best_halve
+from pyvolution.mutation import Mutator, mutate
+from pyvolution.evolution import Evolution
+
+
+def rank_key(entry: Tuple[Individual, Fitness]) -> Tuple[bool, Fitness]:
+    return entry[1] == entry[1], entry[1]
+
+
+@attrs
+class Ranking:
+    """
+    Members collected while evaluations arrive and sorted once when survival needs them. NaN fitness values
+    rank below every other value instead of scrambling the order.
+    >>> ranking = Ranking()
+    >>> for (individual, fitness) in (('a', 1.0), ('b', float('nan')), ('c', 3.0), ('d', 2.0)):
+    ...     ranking.add(individual, fitness)
+    >>> [individual for (individual, _) in ranking.ranked()]
+    ['c', 'd', 'a', 'b']
+    """
+    members: List[Tuple[Individual, Fitness]] = attrib(default=Factory(list))
+
+    def add(self, individual: Individual, fitness: Fitness) -> None:
+        self.members.append((individual, fitness))
+
+    def ranked(self) -> List[Tuple[Individual, Fitness]]:
+        return sorted(self.members, key=rank_key, reverse=True)
+
+
+@attrs
+class Arrivals:
+    """
+    Evaluations submitted to an executor, queued by their done callbacks in the order they finish, so that
+    every finished evaluation can be collected without scanning the ones still running.
+    """
+    executor: Executor = attrib()
+    fitness: FitnessFunction = attrib()
+    queue: SimpleQueue = attrib(default=Factory(SimpleQueue))
+    pending: int = attrib(default=0)
+
+    def submit(self, individual: Individual) -> None:
+        self.executor.submit(self.fitness, individual).add_done_callback(self.arrived(individual))
+        self.pending += 1
+
+    def arrived(self, individual: Individual) -> Callable[[Future], None]:
+        return lambda future: self.queue.put((individual, future))
+
+    def collect(self, ranking: Ranking, allowed: int=0) -> None:
+        """
+        Adds every finished evaluation to the ranking, waiting for more while over allowed are pending.
+        """
+        while self.pending:
+            try:
+                individual, future = self.queue.get(block=self.pending > allowed)
+            except Empty:
+                return
+            ranking.add(individual, future.result())
+            self.pending -= 1
+
+
+def build_pipelined_evolution_model(
+        fitness: FitnessFunction,
+        birth: ChildrenSpawn,
+        executor: Executor,
+        growth: GrowthDetermination=keep_population_size(10),
+        survival: Survival=keep_best_halve,
+        quorum: float=1.0
+) -> Evolution:
+    """
+    Generational evolution like build_evolution_model, but every child is submitted to the executor as soon as
+    it is born, while the next ones are still bred. Evaluations are collected into the ranking of the next
+    generation in the order they finish, between births and after the last one, and the ranking is sorted
+    once when survival needs it. Survival and parent selection of the next generation start as soon as the
+    evaluations of a quorum of the children arrived; the stragglers still running then join the ranking of
+    the generation after. Since survival may depend on any fitness, only quorum=1.0 waits for a complete
+    generation. The last step of every call waits for all evaluations, the result is ranked best first.
+    :param fitness:
+    :param birth:
+    :param executor:
+    :param growth:
+    :param survival:
+    :param quorum: fraction of the children of a generation evaluated before survival runs
+    :return:
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> from pyvolution.birth import top_individuals_breed
+    >>> from pyvolution.types.population import create_sample_population
+    >>> def fitness(individual):
+    ...     return float(sum(g for cs in individual.karyogram.values() for c in cs for g in c.values()))
+    >>> population = create_sample_population(10)
+    >>> with ThreadPoolExecutor(4) as executor:
+    ...     evolve = build_pipelined_evolution_model(fitness, top_individuals_breed(fitness), executor)
+    ...     ranked = evolve(population, 0, 5)
+    ...     hasty = build_pipelined_evolution_model(fitness, top_individuals_breed(fitness), executor, quorum=0.5)
+    ...     hasty_ranked = hasty(population, 0, 5)
+    >>> len(ranked), [f for (_, f) in ranked] == sorted((f for (_, f) in ranked), reverse=True)
+    (10, True)
+    >>> ranked[0][1] >= max(map(fitness, population))
+    True
+    >>> len(hasty_ranked) >= 10, hasty_ranked[0][1] >= max(map(fitness, population))
+    (True, True)
+    """
+    def evolve(
+            population: Iterable[Individual],
+            generation: int,
+            steps: int=1,
+            mutator: Mutator=lambda x: x
+    ) -> RankedPopulation:
+        arrivals, ranking = Arrivals(executor, fitness), Ranking()
+        for individual in population:
+            arrivals.submit(individual)
+        arrivals.collect(ranking)
+        for step in range(steps):
+            survivors = list(survival(ranking.ranked()))
+            ranking = Ranking(list(survivors))
+            children = 0
+            for child in birth((i for (i, _) in survivors), growth(survivors), generation + step + 1):
+                arrivals.submit(mutate(mutator, child))
+                children += 1
+                arrivals.collect(ranking, arrivals.pending)
+            arrivals.collect(ranking, 0 if step == steps - 1 else int(children * (1 - quorum)))
+        return ranking.ranked()
+    return evolve
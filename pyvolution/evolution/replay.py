@@ -0,0 +1,227 @@
+from typing import Callable, Sequence, Optional, Iterable, Dict, List
+from array import array
+from math import nan
+from os.path import exists, getsize
+from attr import attrs, attrib, Factory, evolve
+from pyvolution.types.genealogy import Genealogy
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM, derive_seed
+from pyvolution.types.individual import Individual, Birthing, Counter
+from pyvolution.types.population import RankedPopulation
+from pyvolution.mutation import Mutator, mutate
+from pyvolution.analysis.binary import default_identify
+from pyvolution.evolution import GenerationHook
+
+
+@attrs
+class ReplayLog:
+    """
+    Per birth record of id, generation and parents (kept in a Genealogy) together with the seed the birth
+    was performed with and the fitness of the child, row aligned with the genealogy.
+    """
+    genealogy: Genealogy = attrib(default=Factory(Genealogy))
+    seeds: array = attrib(default=Factory(lambda: array('q')))
+    fitness: array = attrib(default=Factory(lambda: array('d')))
+
+    def __len__(self) -> int:
+        return len(self.genealogy)
+
+    def record(self, identifier: int, generation: int, seed: int, parents: Sequence[int]) -> None:
+        self.genealogy.record(identifier, generation, parents)
+        self.seeds.append(seed)
+        self.fitness.append(nan)
+
+    def seed(self, identifier: int) -> int:
+        return self.seeds[self.genealogy.rows[identifier]]
+
+
+def reproduce(
+        birth: Birthing,
+        mutator: Mutator,
+        parents: Sequence[Individual],
+        generation: int,
+        seed: int,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> Individual:
+    state = rng.getstate()
+    rng.seed(seed)
+    try:
+        return mutate(mutator, birth(parents, generation))
+    finally:
+        rng.setstate(state)
+
+
+def create_seeded_birth(
+        birth: Birthing,
+        log: ReplayLog,
+        root_seed: int,
+        mutator: Mutator=lambda x: x,
+        identify: Callable[[Individual], int]=default_identify,
+        births: Optional[Counter]=None,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> Birthing:
+    """
+    Performs every birth (and the mutation of the child) with the random source the operators draw from seeded from a seed derived
+    from root_seed, and records id, parents and seed in the log. Since the child is then a deterministic
+    function of its parents and the seed, its genome does not need to be stored. The mutator has to be given
+    here instead of to the evolution, so that mutation is covered by the seed as well.
+    :param birth:
+    :param log:
+    :param root_seed:
+    :param mutator:
+    :param identify:
+    :param births:
+    :param rng: the random source used by birth and mutator
+    :return:
+    >>> from random import randint
+    >>> from pyvolution.types.individual import create_birth_builder, create_gamete_builder, select_half, create_sequential_naming
+    >>> from pyvolution.types.population import create_sample_population
+    >>> def operators(naming):
+    ...     return create_birth_builder(create_gamete_builder(select_half), naming)
+    >>> mutator = lambda x: x + randint(-1, 1)
+    >>> adam, eve = create_sample_population(2, size=3, haplodity=2)
+    >>> adam.name, eve.name = 0, 1
+    >>> log = ReplayLog()
+    >>> birth = create_seeded_birth(operators(create_sequential_naming(lambda x: x + 2)), log, 1234, mutator)
+    >>> children = [birth((adam, eve), 1) for _ in range(4)]
+    >>> grandchild = birth((children[1], children[3]), 2)
+    >>> list(log.genealogy.parents(grandchild.name))
+    [3, 5]
+    >>> replay = create_replayer(operators(lambda g, p: None), log, index_individuals([adam, eve]), mutator)
+    >>> replay(grandchild.name).karyogram == grandchild.karyogram
+    True
+    """
+    births = births if births is not None else Counter()
+
+    def give_seeded_birth(parents: Sequence[Individual], generation: int) -> Individual:
+        seed = derive_seed(root_seed, next(births))
+        child = reproduce(birth, mutator, parents, generation, seed, rng)
+        log.record(identify(child), generation, seed, [identify(parent) for parent in parents])
+        return child
+    return give_seeded_birth
+
+
+def create_replay_fitness_hook(
+        log: ReplayLog,
+        identify: Callable[[Individual], int]=default_identify
+) -> GenerationHook:
+    def record_fitness(_: int, population: RankedPopulation) -> None:
+        for (individual, fitness) in population:
+            row = log.genealogy.rows.get(identify(individual))
+            if row is not None:
+                log.fitness[row] = fitness
+    return record_fitness
+
+
+def index_individuals(
+        individuals: Iterable[Individual],
+        identify: Callable[[Individual], int]=default_identify
+) -> Callable[[int], Optional[Individual]]:
+    index = dict((identify(individual), individual) for individual in individuals)
+    return index.get
+
+
+def create_replayer(
+        birth: Birthing,
+        log: ReplayLog,
+        checkpoints: Callable[[int], Optional[Individual]],
+        mutator: Mutator=lambda x: x,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> Callable[[int], Individual]:
+    """
+    Rebuilds individuals from the log by re-applying birth and mutation with the recorded seeds, starting
+    from the closest ancestors found in the checkpoints (at least the initial population). birth has to use
+    the same operators as the recorded run; its naming is ignored.
+    :param birth:
+    :param log:
+    :param checkpoints:
+    :param mutator:
+    :param rng:
+    :return:
+    """
+    genealogy = log.genealogy
+
+    def replay(identifier: int) -> Individual:
+        rebuilt: Dict[int, Individual] = dict()
+        required: List[int] = list()
+        pending = [identifier]
+        while pending:
+            current = pending.pop()
+            if current in rebuilt:
+                continue
+            stored = checkpoints(current)
+            if stored is not None:
+                rebuilt[current] = stored
+                continue
+            if current not in genealogy:
+                raise KeyError('Individual {0} is neither logged nor checkpointed.'.format(current))
+            rebuilt[current] = None
+            required.append(current)
+            pending.extend(genealogy.parents(current))
+
+        for current in sorted(required, key=genealogy.rows.__getitem__):
+            child = reproduce(
+                birth,
+                mutator,
+                [rebuilt[parent] for parent in genealogy.parents(current)],
+                genealogy.generation(current),
+                log.seed(current),
+                rng
+            )
+            rebuilt[current] = evolve(child, name=current)
+        return rebuilt[identifier]
+    return replay
+
+
+def create_replay_store(log: ReplayLog, path: str) -> GenerationHook:
+    """
+    Appends the log rows born since the previous call to path (and their fitness to path.fitness); meant to
+    be used as hook of evolve_until after create_replay_fitness_hook.
+    :param log:
+    :param path:
+    :return:
+    >>> from os.path import join
+    >>> from tempfile import TemporaryDirectory
+    >>> log = ReplayLog()
+    >>> log.record(2, 1, 99, (0, 1))
+    >>> log.fitness[0] = -3.0
+    >>> with TemporaryDirectory() as temp:
+    ...     create_replay_store(log, join(temp, 'replay.bin'))(1, [])
+    ...     loaded = load_replay_log(join(temp, 'replay.bin'))
+    >>> loaded.seed(2), list(loaded.genealogy.parents(2)), list(loaded.fitness)
+    (99, [0, 1], [-3.0])
+    """
+    written = [0]
+
+    def store_replay_log(_: int, __: RankedPopulation) -> None:
+        rows = array(
+            'q',
+            (
+                value
+                for (seed, row) in zip(log.seeds[written[0]:], log.genealogy.rows_since(written[0]))
+                for value in (seed, *row)
+            )
+        )
+        with open(path, 'ab') as out:
+            rows.tofile(out)
+        with open(path + '.fitness', 'ab') as out:
+            log.fitness[written[0]:].tofile(out)
+        written[0] = len(log)
+    return store_replay_log
+
+
+def load_replay_log(path: str) -> ReplayLog:
+    log = ReplayLog()
+    if not exists(path):
+        return log
+    data, fitness = array('q'), array('d')
+    with open(path, 'rb') as src:
+        data.fromfile(src, getsize(path) // data.itemsize)
+    with open(path + '.fitness', 'rb') as src:
+        fitness.fromfile(src, getsize(path + '.fitness') // fitness.itemsize)
+    position = 0
+    while position < len(data):
+        seed, identifier, generation, parents = data[position:position + 4]
+        log.record(identifier, generation, seed, data[position + 4:position + 4 + parents])
+        position += 4 + parents
+    log.fitness = fitness
+    return log
@@ -0,0 +1,153 @@
+from typing import Callable, Sequence, List, Tuple, Optional, Iterable, Dict
+from heapq import heappush, heappushpop, nlargest
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+from attr import attrs, attrib, Factory
+from pyvolution.types.individual import Individual, Birthing
+from pyvolution.types.population import Fitness, FitnessFunction, RankedPopulation
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM
+from pyvolution.mutation import Mutator, mutate
+from pyvolution.evolution import GenerationHook
+
+SteadyBreeder = Callable[['SteadyPopulation', int], Individual]
+SteadyStopCriteria = Callable[['SteadyPopulation'], bool]
+
+
+@attrs
+class SteadyPopulation:
+    """
+    Population of bounded size kept as a min-heap on fitness: adding a member and dropping the worst one costs
+    O(log N), tournaments pick uniformly from the heap in O(1) per contestant.
+    """
+    capacity: int = attrib()
+    entries: List[Tuple[Fitness, int, Individual]] = attrib(default=Factory(list))
+    arrivals: int = attrib(default=0)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, individual: Individual, fitness: Fitness) -> Optional[Tuple[Individual, Fitness]]:
+        """
+        :param individual:
+        :param fitness:
+        :return: the member dropped to stay within capacity, if any
+        """
+        entry = (fitness, self.arrivals, individual)
+        self.arrivals += 1
+        if len(self.entries) < self.capacity:
+            heappush(self.entries, entry)
+            return None
+        worst, _, dropped = heappushpop(self.entries, entry)
+        return dropped, worst
+
+    def worst(self) -> Tuple[Individual, Fitness]:
+        fitness, _, individual = self.entries[0]
+        return individual, fitness
+
+    def best(self, amount: int=1) -> RankedPopulation:
+        return [(individual, fitness) for (fitness, _, individual) in nlargest(amount, self.entries)]
+
+    def ranked(self) -> RankedPopulation:
+        return [(individual, fitness) for (fitness, _, individual) in sorted(self.entries, reverse=True)]
+
+    def tournament(self, size: int=2, rng: RandomSource=GLOBAL_RANDOM) -> Individual:
+        return max(rng.choices(self.entries, k=size))[2]
+
+
+def create_steady_population(
+        fitness: FitnessFunction,
+        population: Iterable[Individual],
+        capacity: Optional[int]=None
+) -> SteadyPopulation:
+    members = list(population)
+    steady = SteadyPopulation(capacity if capacity is not None else len(members))
+    for individual in members:
+        steady.add(individual, fitness(individual))
+    return steady
+
+
+def create_steady_state_breeder(
+        birth: Birthing,
+        parents: int=2,
+        tournament: int=2,
+        mutator: Mutator=lambda x: x,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> SteadyBreeder:
+    def breed(population: SteadyPopulation, step: int) -> Individual:
+        return mutate(mutator, birth([population.tournament(tournament, rng) for _ in range(parents)], step))
+    return breed
+
+
+def evaluate_inline(fitness: FitnessFunction, individual: Individual) -> Future:
+    future = Future()
+    future.set_result(fitness(individual))
+    return future
+
+
+def evolve_steady_state(
+        fitness: FitnessFunction,
+        breed: SteadyBreeder,
+        population: SteadyPopulation,
+        until: SteadyStopCriteria,
+        replacements: int=1,
+        executor: Optional[Executor]=None,
+        in_flight: Optional[int]=None,
+        step: int=0,
+        hooks: Sequence[GenerationHook]=tuple()
+) -> SteadyPopulation:
+    """
+    Steady state evolution: every step adds replacements children, each displacing the worst member once the
+    population is at capacity. With an executor up to in_flight children are evaluated concurrently and every
+    finished evaluation is inserted right away, while new children are bred from the current population, so
+    no evaluation waits for a generation barrier. A step then counts replacements arrivals. Hooks receive the
+    ranked population after every step.
+    :param fitness:
+    :param breed:
+    :param population:
+    :param until:
+    :param replacements:
+    :param executor:
+    :param in_flight: children evaluated concurrently, replacements by default
+    :param step:
+    :param hooks:
+    :return:
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> from pyvolution.birth import default_birth
+    >>> from pyvolution.evolution import create_step_stop_criteria
+    >>> from pyvolution.types.individual import create_sequential_naming
+    >>> from pyvolution.types.population import create_sample_population
+    >>> def fitness(individual):
+    ...     return float(sum(g for cs in individual.karyogram.values() for c in cs for g in c.values()))
+    >>> breed = create_steady_state_breeder(default_birth(naming=create_sequential_naming()), tournament=3)
+    >>> population = create_steady_population(fitness, create_sample_population(20))
+    >>> start = population.best()[0][1]
+    >>> population = evolve_steady_state(fitness, breed, population, create_step_stop_criteria(100), 2)
+    >>> len(population), population.best()[0][1] >= start, population.arrivals
+    (20, True, 222)
+    >>> with ThreadPoolExecutor(4) as executor:
+    ...     population = evolve_steady_state(fitness, breed, population, create_step_stop_criteria(50), 2, executor, 8)
+    >>> len(population), population.worst()[1] >= start / 2
+    (20, True)
+    """
+    submit = executor.submit if executor is not None else evaluate_inline
+    in_flight = in_flight if in_flight else replacements
+    pending: Dict[Future, Individual] = dict()
+    arrivals = 0
+    try:
+        while True:
+            while len(pending) < in_flight:
+                child = breed(population, step + 1)
+                pending[submit(fitness, child)] = child
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                population.add(pending.pop(future), future.result())
+                arrivals += 1
+                if arrivals % replacements:
+                    continue
+                step += 1
+                for hook in hooks:
+                    hook(step, population.ranked())
+                if until(population):
+                    return population
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,271 @@
+from typing import Callable, Sequence, List, Tuple, Optional, Dict, Any
+from array import array
+from itertools import count
+from multiprocessing import get_context
+from selectors import DefaultSelector, EVENT_READ
+from socket import socket, create_connection, create_server
+from struct import Struct
+from threading import Thread, Lock, Event
+from time import monotonic
+from traceback import format_exc
+from attr import attrs, attrib
+from pyvolution.types.individual import Individual
+from pyvolution.types.population import FitnessFunction, Population, RankedPopulation
+from pyvolution.analysis.binary import GenomeCodec, encode_generation, read_generation_columns, decode_individuals
+from pyvolution.fitness.shared import split_rows
+
+FRAME = Struct('!BQ')
+TASK_ID = Struct('!Q')
+TASK, RESULT, HEARTBEAT, FAILURE, STOP = range(1, 6)
+Address = Tuple[str, int]
+
+
+def receive_exactly(connection: socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view, received = memoryview(buffer), 0
+    while received < size:
+        chunk = connection.recv_into(view[received:])
+        if not chunk:
+            raise ConnectionError('Connection closed by peer.')
+        received += chunk
+    return bytes(buffer)
+
+
+def send_message(connection: socket, kind: int, payload: bytes=b'') -> None:
+    connection.sendall(FRAME.pack(kind, len(payload)) + payload)
+
+
+def receive_message(connection: socket) -> Tuple[int, bytes]:
+    """
+    :param connection:
+    :return:
+    >>> from socket import socketpair
+    >>> left, right = socketpair()
+    >>> send_message(left, RESULT, b'payload')
+    >>> receive_message(right)
+    (2, b'payload')
+    """
+    kind, size = FRAME.unpack(receive_exactly(connection, FRAME.size))
+    return kind, receive_exactly(connection, size)
+
+
+def serve_worker(
+        fitness: FitnessFunction,
+        codec: GenomeCodec=GenomeCodec(),
+        host: str='127.0.0.1',
+        port: int=0,
+        heartbeat: float=1.0,
+        ready: Optional[Callable[[Address], None]]=None,
+        individual_type: Callable[..., Individual]=Individual
+) -> None:
+    """
+    Evaluation worker: accepts one coordinator at a time and answers every task (an id and a binary generation
+    block) with the fitness values of its rows, sending heartbeats every heartbeat seconds meanwhile. Returns
+    once a coordinator sends STOP.
+    :param fitness:
+    :param codec:
+    :param host:
+    :param port: 0 picks a free port, reported through ready
+    :param heartbeat:
+    :param ready:
+    :param individual_type:
+    :return:
+    """
+    with create_server((host, port)) as server:
+        if ready is not None:
+            ready(server.getsockname()[:2])
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                lock, stopped = Lock(), Event()
+
+                def beat() -> None:
+                    while not stopped.wait(heartbeat):
+                        with lock:
+                            send_message(connection, HEARTBEAT)
+                Thread(target=beat, daemon=True).start()
+                try:
+                    while True:
+                        kind, payload = receive_message(connection)
+                        if kind == STOP:
+                            return
+                        task = payload[:TASK_ID.size]
+                        try:
+                            individuals = decode_individuals(
+                                read_generation_columns(payload[TASK_ID.size:]), codec, None, individual_type
+                            )
+                            kind, reply = RESULT, array('d', map(fitness, individuals)).tobytes()
+                        except Exception:
+                            kind, reply = FAILURE, format_exc().encode('utf-8')
+                        with lock:
+                            send_message(connection, kind, task + reply)
+                except (ConnectionError, OSError):
+                    pass
+                finally:
+                    stopped.set()
+
+
+def report_address(queue: Any, fitness: FitnessFunction, codec: GenomeCodec, heartbeat: float) -> None:
+    serve_worker(fitness, codec, heartbeat=heartbeat, ready=queue.put)
+
+
+def start_local_workers(
+        fitness: FitnessFunction,
+        workers: int,
+        codec: GenomeCodec=GenomeCodec(),
+        heartbeat: float=1.0,
+        context: Optional[str]=None
+) -> Tuple[List[Address], List[Any]]:
+    """
+    Starts worker servers on free localhost ports, e.g. for tests or a single machine.
+    :return: their addresses and processes
+    """
+    mp = get_context(context)
+    queue = mp.Queue()
+    processes = [
+        mp.Process(target=report_address, args=(queue, fitness, codec, heartbeat), daemon=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    return [tuple(queue.get()) for _ in processes], processes
+
+
+@attrs
+class RemoteWorker:
+    address: Address = attrib()
+    connection: Optional[socket] = attrib(default=None)
+    task: Optional[int] = attrib(default=None)
+    seen: float = attrib(default=0.0)
+
+    def connect(self, timeout: float) -> bool:
+        try:
+            self.connection = create_connection(self.address, timeout=timeout)
+            self.connection.settimeout(timeout)
+            self.seen = monotonic()
+            return True
+        except OSError:
+            self.connection = None
+            return False
+
+    def drop(self) -> Optional[int]:
+        task, self.task = self.task, None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        return task
+
+
+def create_remote_evaluator(
+        addresses: Sequence[Address],
+        codec: GenomeCodec=GenomeCodec(),
+        chunk: int=64,
+        timeout: float=10.0
+) -> Tuple[Callable[[Population], RankedPopulation], Callable[[], None]]:
+    """
+    Evaluation backend for build_evolution_model distributing chunks of the population, encoded as binary
+    generation blocks, to worker servers. A worker that closes its connection or stays silent (no result or
+    heartbeat) for timeout seconds is dropped and its chunk is dispatched again to another worker; dropped
+    workers are reconnected at the next evaluation. As with the shared memory evaluator, workers see decoded
+    individuals named by their row.
+    :param addresses:
+    :param codec:
+    :param chunk: rows per task
+    :param timeout:
+    :return: the evaluation and a function stopping the workers
+    >>> from pyvolution.types.population import create_sample_population
+    >>> def fitness(individual):
+    ...     return float(sum(g for cs in individual.karyogram.values() for c in cs for g in c.values()))
+    >>> addresses, processes = start_local_workers(fitness, 3, GenomeCodec('q'), heartbeat=0.1, context='fork')
+    >>> evaluate, close = create_remote_evaluator(addresses, GenomeCodec('q'), chunk=8, timeout=2.0)
+    >>> population = create_sample_population(40)
+    >>> [f for (_, f) in evaluate(population)] == [fitness(i) for i in population]
+    True
+    >>> processes[0].terminate()
+    >>> [f for (_, f) in evaluate(population)] == [fitness(i) for i in population]
+    True
+    >>> close()
+    """
+    workers = [RemoteWorker(tuple(address)) for address in addresses]
+
+    def evaluate(population: Population) -> RankedPopulation:
+        members = list(population)
+        for worker in workers:
+            if worker.connection is None:
+                worker.connect(timeout)
+        rows = split_rows(len(members), chunk)
+        blocks: Dict[int, bytes] = dict()
+        for (task, (start, stop)) in enumerate(rows):
+            identifiers = count(start)
+            blocks[task] = TASK_ID.pack(task) + encode_generation(
+                members[start:stop], codec, lambda _: next(identifiers)
+            )
+        results: List[Optional[float]] = [None] * len(members)
+        queued, done = list(reversed(range(len(rows)))), set()
+        selector = DefaultSelector()
+        try:
+            while len(done) < len(rows):
+                alive = [worker for worker in workers if worker.connection is not None]
+                if not alive:
+                    raise RuntimeError('All remote workers are lost.')
+                for worker in alive:
+                    if worker.task is None and queued:
+                        task = queued.pop()
+                        if task in done:
+                            continue
+                        worker.task, worker.seen = task, monotonic()
+                        try:
+                            send_message(worker.connection, TASK, blocks[task])
+                        except OSError:
+                            queued.append(worker.drop())
+                for worker in alive:
+                    if worker.connection is not None:
+                        selector.register(worker.connection, EVENT_READ, worker)
+                events = selector.select(timeout / 4)
+                for (key, _) in events:
+                    worker = key.data
+                    try:
+                        kind, payload = receive_message(worker.connection)
+                    except OSError:
+                        lost = worker.drop()
+                        if lost is not None:
+                            queued.append(lost)
+                        continue
+                    worker.seen = monotonic()
+                    if kind == FAILURE:
+                        raise RuntimeError(
+                            'Remote evaluation failed on {0}:\n{1}'.format(
+                                worker.address, payload[TASK_ID.size:].decode('utf-8')
+                            )
+                        )
+                    if kind == RESULT:
+                        (task,) = TASK_ID.unpack_from(payload)
+                        if task not in done:
+                            start, stop = rows[task]
+                            results[start:stop] = array('d', payload[TASK_ID.size:])
+                            done.add(task)
+                        if worker.task == task:
+                            worker.task = None
+                for worker in alive:
+                    if worker.connection is not None:
+                        selector.unregister(worker.connection)
+                        if worker.task is not None and monotonic() - worker.seen > timeout:
+                            queued.append(worker.drop())
+            return list(zip(members, results))
+        finally:
+            selector.close()
+            # results still owed to this call would be mistaken for the tasks of the next one
+            for worker in workers:
+                if worker.task is not None:
+                    worker.drop()
+
+    def close() -> None:
+        for worker in workers:
+            if worker.connection is not None:
+                try:
+                    send_message(worker.connection, STOP)
+                except OSError:
+                    pass
+                worker.drop()
+
+    return evaluate, close
@@ -0,0 +1,264 @@
+from typing import Callable, List, Tuple, Optional, Any
+from array import array
+from itertools import count
+from multiprocessing import get_context
+from multiprocessing.connection import Connection, wait
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.resource_tracker import ensure_running
+from struct import Struct
+from time import monotonic
+from traceback import format_exc
+from attr import attrs, attrib
+from pyvolution.types.individual import Individual
+from pyvolution.types.population import FitnessFunction, Population, RankedPopulation
+from pyvolution.analysis.binary import GenomeCodec, encode_generation, read_generation_columns, decode_individuals
+
+Task = Tuple[str, int, int]
+VALUE = Struct('d')
+VALUES, STARTED, FAILURE = b'v', b's', b'f'
+
+
+@attrs
+class Worker:
+    process: Any = attrib()
+    connection: Connection = attrib()
+    task: Optional[Task] = attrib(default=None)
+    received: int = attrib(default=0)
+    deadline: float = attrib(default=0.0)
+
+
+def evaluate_shared_rows(
+        fitness: FitnessFunction,
+        codec: GenomeCodec,
+        individual_type: Callable[..., Individual],
+        task: Task
+) -> bytes:
+    name, start, stop = task
+    # attaching registers the block again with the resource tracker shared with the creator, a no-op
+    memory = SharedMemory(name)
+    try:
+        columns = read_generation_columns(memory.buf)
+        individuals = decode_individuals(columns, codec, range(start, stop), individual_type)
+        del columns
+        return array('d', map(fitness, individuals)).tobytes()
+    finally:
+        memory.close()
+
+
+def stream_fitness(connection: Connection, fitness: FitnessFunction) -> FitnessFunction:
+    def evaluate(individual: Individual) -> float:
+        value = fitness(individual)
+        connection.send_bytes(VALUES + VALUE.pack(value))
+        return value
+    return evaluate
+
+
+def serve_shared_evaluations(
+        connection: Connection,
+        fitness: FitnessFunction,
+        codec: GenomeCodec,
+        individual_type: Callable[..., Individual],
+        streaming: bool=False
+) -> None:
+    evaluate = stream_fitness(connection, fitness) if streaming else fitness
+    while True:
+        task = connection.recv()
+        if task is None:
+            return
+        if streaming:
+            # time limits count from here, a replacement worker may still have been starting up
+            connection.send_bytes(STARTED)
+        try:
+            values = evaluate_shared_rows(evaluate, codec, individual_type, task)
+        except Exception:
+            connection.send_bytes(FAILURE + format_exc().encode('utf-8'))
+            continue
+        if not streaming:
+            connection.send_bytes(VALUES + values)
+
+
+def split_rows(size: int, chunk: int) -> List[Tuple[int, int]]:
+    """
+    :param size:
+    :param chunk:
+    :return:
+    >>> split_rows(5, 2)
+    [(0, 2), (2, 4), (4, 5)]
+    """
+    return [(start, min(start + chunk, size)) for start in range(0, size, chunk)]
+
+
+def create_shared_memory_evaluator(
+        fitness: FitnessFunction,
+        codec: GenomeCodec=GenomeCodec(),
+        workers: int=2,
+        chunk: int=64,
+        individual_type: Callable[..., Individual]=Individual,
+        context: Optional[str]=None,
+        timeout: Optional[float]=None,
+        timeout_fitness: float=-float('infinity'),
+        report: Optional[Callable[[int], None]]=None
+) -> Tuple[Callable[[Population], RankedPopulation], Callable[[], None]]:
+    """
+    Evaluates populations in worker processes without pickling genomes: the population is encoded once per
+    call into a binary generation block in shared memory, workers map it and decode only the rows of the
+    index ranges they receive, and only the fitness values travel back. Workers see individuals decoded by
+    the codec (chromosomes built by codec.create_chromosome, the row as name), so the fitness must only depend
+    on the karyogram. Returns the evaluation, usable as evaluation of build_evolution_model, and a function
+    stopping the workers. Exceptions of the fitness are raised as RuntimeError with the traceback of the
+    worker, and workers that die or are still busy when an evaluation fails are replaced.
+    With a timeout workers acknowledge every task once they start it and send every fitness value as soon as
+    it is computed; an individual whose evaluation takes longer than timeout seconds gets timeout_fitness,
+    its worker is killed and replaced, and the rest of its rows are dispatched again. report receives the
+    number of timeouts of every evaluated population.
+    :param fitness:
+    :param codec:
+    :param workers:
+    :param chunk: rows per task
+    :param individual_type:
+    :param context: multiprocessing start method, fitness and codec have to be picklable unless it is 'fork'
+    :param timeout: seconds per evaluation, unlimited if None
+    :param timeout_fitness:
+    :param report:
+    :return:
+    >>> from pyvolution.types.population import create_sample_population
+    >>> def fitness(individual):
+    ...     return float(sum(g for cs in individual.karyogram.values() for c in cs for g in c.values()))
+    >>> population = create_sample_population(50)
+    >>> evaluate, close = create_shared_memory_evaluator(fitness, GenomeCodec('q'), workers=3, chunk=8, context='fork')
+    >>> ranked = evaluate(population)
+    >>> [f for (_, f) in ranked] == [fitness(i) for i in population], ranked[7][0] is population[7]
+    (True, True)
+    >>> from pyvolution.birth import top_individuals_breed
+    >>> from pyvolution.evolution import build_evolution_model, evolve_until, create_step_stop_criteria
+    >>> evolve = build_evolution_model(fitness, top_individuals_breed(fitness), evaluation=evaluate)
+    >>> len(evolve_until(evolve, population, create_step_stop_criteria(3), finalisers=[close]))
+    10
+    >>> from time import sleep
+    >>> def runaway(individual):
+    ...     if individual.name in (3, 11):
+    ...         sleep(60)
+    ...     return fitness(individual)
+    >>> timeouts = list()
+    >>> evaluate, close = create_shared_memory_evaluator(
+    ...     runaway, GenomeCodec('q'), workers=2, chunk=8, context='fork', timeout=0.2, report=timeouts.append
+    ... )
+    >>> ranked = evaluate(population)
+    >>> values = [f for (_, f) in ranked]
+    >>> values[3], values[11], timeouts
+    (-inf, -inf, [2])
+    >>> values[:3] + values[4:11] + values[12:] == [fitness(i) for i in population[:3] + population[4:11] + population[12:]]
+    True
+    >>> close()
+    >>> def failing(individual):
+    ...     if individual.name == 5:
+    ...         raise ValueError('cannot rank {0}'.format(individual.name))
+    ...     return fitness(individual)
+    >>> evaluate, close = create_shared_memory_evaluator(failing, GenomeCodec('q'), workers=2, chunk=4, context='fork')
+    >>> try:
+    ...     evaluate(population)
+    ... except RuntimeError as error:
+    ...     print(str(error).splitlines()[-1])
+    ValueError: cannot rank 5
+    >>> [f for (_, f) in evaluate(population[:5])] == [fitness(i) for i in population[:5]]
+    True
+    >>> close()
+    """
+    mp = get_context(context)
+    streaming = timeout is not None
+    # workers, including the ones replacing killed workers, have to share the tracker of the creator
+    ensure_running()
+
+    def spawn() -> Worker:
+        local, remote = mp.Pipe()
+        process = mp.Process(
+            target=serve_shared_evaluations, args=(remote, fitness, codec, individual_type, streaming), daemon=True
+        )
+        process.start()
+        remote.close()
+        return Worker(process, local)
+
+    pool: List[Worker] = [spawn() for _ in range(workers)]
+
+    def replace(index: int) -> None:
+        worker = pool[index]
+        worker.process.kill()
+        worker.process.join()
+        worker.connection.close()
+        pool[index] = spawn()
+
+    def evaluate(population: Population) -> RankedPopulation:
+        members = list(population)
+        if not members:
+            return list()
+        rows = count()
+        block = encode_generation(members, codec, lambda _: next(rows))
+        memory = SharedMemory(create=True, size=len(block))
+        timeouts = 0
+        try:
+            memory.buf[:len(block)] = block
+            results = [0.0] * len(members)
+            tasks = [(memory.name, start, stop) for (start, stop) in split_rows(len(members), chunk)]
+            tasks.reverse()
+            while tasks or any(worker.task for worker in pool):
+                for worker in pool:
+                    if worker.task is None and tasks:
+                        worker.task, worker.received, worker.deadline = tasks.pop(), 0, float('infinity')
+                        worker.connection.send(worker.task)
+                busy = dict((worker.connection, worker) for worker in pool if worker.task)
+                deadline = min(worker.deadline for worker in busy.values()) if streaming else float('infinity')
+                remaining = max(deadline - monotonic(), 0.0) if deadline < float('infinity') else None
+                for connection in wait(list(busy), remaining):
+                    worker = busy[connection]
+                    name, start, stop = worker.task
+                    try:
+                        message = connection.recv_bytes()
+                    except (EOFError, OSError):
+                        raise RuntimeError('Shared memory evaluation worker died on rows {0}:{1}.'.format(start, stop))
+                    kind, payload = message[:1], message[1:]
+                    if kind == FAILURE:
+                        worker.task = None
+                        raise RuntimeError('Shared memory evaluation failed:\n{0}'.format(payload.decode('utf-8')))
+                    if not streaming:
+                        results[start:stop] = array('d', payload)
+                        worker.task = None
+                        continue
+                    worker.deadline = monotonic() + timeout
+                    if kind == STARTED:
+                        continue
+                    (results[start + worker.received],) = VALUE.unpack(payload)
+                    worker.received += 1
+                    if start + worker.received == stop:
+                        worker.task = None
+                if not streaming:
+                    continue
+                for (index, worker) in enumerate(pool):
+                    if worker.task is None or monotonic() < worker.deadline or worker.connection.poll():
+                        continue
+                    name, start, stop = worker.task
+                    row = start + worker.received
+                    results[row] = timeout_fitness
+                    timeouts += 1
+                    if row + 1 < stop:
+                        tasks.append((name, row + 1, stop))
+                    replace(index)
+            if report is not None:
+                report(timeouts)
+            return list(zip(members, results))
+        finally:
+            # workers still busy after a failure would answer into the next evaluation, dead ones never again
+            for (index, worker) in enumerate(pool):
+                if worker.task is not None or not worker.process.is_alive():
+                    replace(index)
+            memory.close()
+            memory.unlink()
+
+    def close() -> None:
+        for worker in pool:
+            if worker.process.is_alive():
+                worker.connection.send(None)
+        for worker in pool:
+            worker.process.join()
+            worker.connection.close()
+
+    return evaluate, close
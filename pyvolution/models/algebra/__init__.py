@@ -1,9 +1,9 @@
-from typing import TypeVar, Sequence, Tuple, Callable, Generator, Dict, Optional, cast, Sized
-from random import random, uniform, randint
+from typing import TypeVar, Sequence, Tuple, Callable, Generator, Dict, Optional, Iterator, cast, Sized
 from operator import add, sub, mul, truediv, pow
 from enum import Enum
 from attr import attrib, attrs
 from pyvolution.types.gene import remap_genome
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM, random_floats
 
 
 DomainType = TypeVar('DomainType')
@@ -137,13 +137,45 @@ def evaluate(
 
 def create_default_mutator(
         type_propability: float=0.1,
-        value_propability: float=0.1
+        value_propability: float=0.1,
+        rng: RandomSource=GLOBAL_RANDOM,
+        block: int=4096
 ) -> Callable[[DefaultSeed], DefaultSeed]:
+    """
+    Shifts the seed type by -1, 0 or 1 with type_propability and adds an offset uniform in [-1, 1) to the value
+    with value_propability. The decisions are drawn for block seeds at a time, one rng.choices call each for
+    the type shifts and the value decisions and one random_floats call for the offsets of the mutating values.
+    :param type_propability:
+    :param value_propability:
+    :param rng:
+    :param block: seeds per draw
+    :return:
+    >>> from pyvolution.types.rng import spawn_random_streams
+    >>> seeds = [(DefaultSeedTypes.CONSTANT, 1.0)] * 5000
+    >>> def mutated(rng):
+    ...     return list(map(create_default_mutator(0.3, 0.2, rng, block=1000), seeds))
+    >>> first = mutated(spawn_random_streams(4, 1)[0])
+    >>> first == mutated(spawn_random_streams(4, 1)[0])
+    True
+    >>> 0.15 < sum(t != DefaultSeedTypes.CONSTANT for (t, _) in first) / len(seeds) < 0.25
+    True
+    >>> 0.15 < sum(v != 1.0 for (_, v) in first) / len(seeds) < 0.25, all(0.0 <= v < 2.0 for (_, v) in first)
+    (True, True)
+    """
+    shifts, shift_weights = (-1, 0, 1), (type_propability / 3, 1 - type_propability * 2 / 3, type_propability / 3)
+    decisions, decision_weights = (True, False), (value_propability, 1 - value_propability)
+
+    def draw_blocks() -> Iterator[Tuple[int, float]]:
+        while True:
+            mutating = rng.choices(decisions, decision_weights, k=block)
+            offsets = iter(random_floats(mutating.count(True), rng))
+            values = [2.0 * next(offsets) - 1.0 if mutates else 0.0 for mutates in mutating]
+            yield from zip(rng.choices(shifts, shift_weights, k=block), values)
+    draws = draw_blocks()
+
     def mutate_seed(seed: DefaultSeed) -> DefaultSeed:
-        return (
-            DefaultSeedTypes.map_modul(seed[0].value + (randint(-1, 1) if random() <= type_propability else 0)),
-            seed[1] + (uniform(-1.0, 1.0) if random() <= value_propability else 0.0)
-        )
+        shift, offset = next(draws)
+        return DefaultSeedTypes.map_modul(seed[0].value + shift), seed[1] + offset
     return mutate_seed
 
 
@@ -1,24 +1,31 @@
 from typing import Tuple, Union, Sequence, Callable, Optional, Iterator
 from sys import maxsize
 from itertools import chain
-from random import randint, random
 from math import sqrt, isnan
 from json import JSONEncoder
-from pyvolution.types.gene import create_linear_mapping, create_chromosome_builder, Crossover, remap_genome
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM, random_floats
+from pyvolution.types.gene import (
+    create_linear_mapping, create_chromosome_builder, Crossover, remap_genome, FrozenChromosome
+)
 from pyvolution.survival import keep_best_halve
 from pyvolution.types.population import GrowthDetermination, keep_population_size, Fitness, Survival
-from pyvolution.types.individual import create_individual_builder, Naming, create_sequential_naming, Individual
+from pyvolution.types.individual import create_individual_builder, Naming, create_sequential_naming, Individual, Counter
 from pyvolution.fitness import create_fitness
 from pyvolution.models.algebra import (
     Expression, evaluate, DefaultSeed, DefaultSeedTypes, create_expression_parser, DEFAULT_FUNCTIONS, DEFAULT_VARIABLES,
     create_default_interpretation, Function, create_default_mutator, show_expression
 )
 from pyvolution.evolution import build_evolution_model
-from pyvolution.birth import top_individuals_breed, Birthing
+from pyvolution.birth import top_individuals_batch_breed, Birthing
 from pyvolution.anomalies import Anomaly
+from pyvolution.analysis.binary import GenomeCodec
 
 
 Point = Union[Tuple[float, float], Tuple[float, float, float]]
+BASIC_ALGEBRA_CODEC = GenomeCodec(
+    'd', 2, lambda seed: (seed[0].value, seed[1]), lambda values: (DefaultSeedTypes(int(values[0])), values[1]),
+    FrozenChromosome
+)
 
 
 def default_dominance(genes: Sequence[DefaultSeed]) -> DefaultSeed:
@@ -26,8 +33,26 @@ def default_dominance(genes: Sequence[DefaultSeed]) -> DefaultSeed:
     return DefaultSeedTypes.map_modul(sum(x.value for x in function_types)), sum(values)
 
 
-def random_seed() -> DefaultSeed:
-    return DefaultSeedTypes.map_modul(randint(0, maxsize)), random()
+def random_seed(rng: RandomSource=GLOBAL_RANDOM) -> DefaultSeed:
+    return DefaultSeedTypes.map_modul(rng.randint(0, maxsize)), rng.random()
+
+
+def random_seeds(amount: int, rng: RandomSource=GLOBAL_RANDOM) -> Iterator[DefaultSeed]:
+    """
+    Draws the seeds of a whole population at once.
+    :param amount:
+    :param rng:
+    :return:
+    >>> from pyvolution.models.algebra import create_default_mutator
+    >>> from pyvolution.types.rng import spawn_random_streams
+    >>> def drawn(seed):
+    ...     rng = spawn_random_streams(seed, 1)[0]
+    ...     return list(map(create_default_mutator(0.5, 0.5, rng), random_seeds(100, rng)))
+    >>> drawn(1) == drawn(1), drawn(1) == drawn(2)
+    (True, False)
+    """
+    types = rng.choices(tuple(DefaultSeedTypes), k=amount)
+    return zip(types, random_floats(amount, rng))
 
 
 def create_basic_model_fitness(points: Sequence[Point]) -> Fitness:
@@ -69,7 +94,9 @@ def create_basic_model(
         naming: Optional[Naming]=None,
         birth: Optional[Birthing]=None,
         growth: Optional[GrowthDetermination]=None,
-        survival: Optional[Survival]=None
+        survival: Optional[Survival]=None,
+        rng: RandomSource=GLOBAL_RANDOM,
+        meta_id: Optional[Counter]=None
 ):
     """
     :param points:
@@ -84,6 +111,8 @@ def create_basic_model(
     :param birth:
     :param growth:
     :param survival:
+    :param rng: random source of the initial population and the default birth
+    :param meta_id: meta id source of the default birth
     :return:
     >>> from itertools import cycle
     >>> points = cycle([[(0, 1, 0), (0, -1, 0), (1, 0, 0), (-1, 0, 0), (2, 0, 1), (0, 5, 4)]])
@@ -105,7 +134,7 @@ def create_basic_model(
         create_default_interpretation(tuple(chain(DEFAULT_FUNCTIONS, additional_functions)))
     )
     ifitness = create_fitness(create_basic_model_fitness(points), remapping, parser, dominance)
-    chromosome_builder = create_chromosome_builder(lambda x: x, mapping)
+    chromosome_builder = create_chromosome_builder(lambda x: x, mapping, frozen=True)
     individual_builder = create_individual_builder(
         chromosome_builder,
         naming if naming else create_sequential_naming(lambda x: x-popsize),
@@ -113,12 +142,13 @@ def create_basic_model(
     )
     evolution = build_evolution_model(
         ifitness,
-        birth if birth else top_individuals_breed(ifitness, xover, anomaly),
+        birth if birth else top_individuals_batch_breed(ifitness, xover, anomaly, rng=rng, meta_id=meta_id),
         growth if growth else keep_population_size(popsize),
         survival if survival else keep_best_halve
     )
+    seeds = random_seeds(popsize * karyosize * gene_count, rng)
     population = tuple(
-        individual_builder(((random_seed() for _ in range(gene_count)) for _ in range(karyosize)), 0)
+        individual_builder(((next(seeds) for _ in range(gene_count)) for _ in range(karyosize)), 0)
         for _ in range(popsize)
     )
     def to_expression(individual: Individual) -> Expression:
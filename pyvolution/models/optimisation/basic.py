@@ -1,14 +1,14 @@
 from typing import Callable, Sequence, Optional, List
 from math import sqrt, isnan
 from sys import stderr
-from random import uniform
 from pyvolution.naming import create_default_naming
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM
 from pyvolution.evolution import build_evolution_model
-from pyvolution.types.individual import Naming, create_individual_builder, Spawning, Individual
+from pyvolution.types.individual import Naming, create_individual_builder, Spawning, Individual, Counter
 from pyvolution.fitness import create_fitness
 from pyvolution.types.gene import Crossover, Anomaly, create_linear_mapping, create_chromosome_builder, remap_genome
 from pyvolution.types.population import Birthing, GrowthDetermination, Survival, keep_population_size
-from pyvolution.birth import top_individuals_breed
+from pyvolution.birth import top_individuals_batch_breed
 from pyvolution.survival import keep_best_halve
 from pyvolution.models.optimisation import TestFunction
 
@@ -21,9 +21,13 @@ def create_model_fitness(funcs: Sequence[TestFunction]):
     return optimisation_function_fitness
 
 
-def create_random_arguments_creator(a: float, b: float) -> Callable[[int], Sequence[float]]:
+def create_random_arguments_creator(
+        a: float,
+        b: float,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> Callable[[int], Sequence[float]]:
     def create_random_arguments(size: int) -> Sequence[float]:
-        return [uniform(a, b) for _ in range(size)]
+        return [a + (b - a) * rng.random() for _ in range(size)]
 
     return create_random_arguments
 
@@ -38,7 +42,9 @@ def create_basic_model(
         birth: Optional[Birthing] = None,
         growth: Optional[GrowthDetermination] = None,
         survival: Optional[Survival] = None,
-        random: Callable[[int], Sequence[float]]=create_random_arguments_creator(-10, 10)
+        random: Optional[Callable[[int], Sequence[float]]]=None,
+        rng: RandomSource=GLOBAL_RANDOM,
+        meta_id: Optional[Counter]=None
 ):
     """
     :param test_functions:
@@ -51,7 +57,9 @@ def create_basic_model(
     :param birth:
     :param growth:
     :param survival:
-    :param random:
+    :param random: creator of initial arguments, uniform in [-10, 10] drawn from rng by default
+    :param rng:
+    :param meta_id: meta id source of the default birth
     :return:
     >>> from pyvolution.evolution import create_step_stop_criteria, evolve_until
     >>> population, evolution, remap = create_basic_model([TestFunction(lambda xs: sum(map(abs, xs)))])
@@ -85,7 +93,7 @@ def create_basic_model(
     mapping, remapping = create_linear_mapping(chromosome_size)
     fitness = create_model_fitness(test_functions)
     ifitness = create_fitness(fitness, remapping, reverse_transcription, dominance)
-    chromosome_builder = create_chromosome_builder(transcription, mapping)
+    chromosome_builder = create_chromosome_builder(transcription, mapping, frozen=True)
     naming = naming if naming else create_default_naming()
     individual_builder: Spawning = create_individual_builder(
         chromosome_builder,
@@ -94,11 +102,12 @@ def create_basic_model(
     )
     evolution = build_evolution_model(
         ifitness,
-        birth if birth else top_individuals_breed(ifitness, xover, anomaly, naming),
+        birth if birth else top_individuals_batch_breed(ifitness, xover, anomaly, naming, rng=rng, meta_id=meta_id),
         growth if growth else keep_population_size(popsize),
         survival if survival else keep_best_halve
     )
 
+    random = random if random else create_random_arguments_creator(-10, 10, rng)
     population = [
         individual_builder([[random(arity) for _ in range(gene_count)] for _ in range(karyosize)], 0)
         for _ in range(popsize)
@@ -1,33 +1,55 @@
 from typing import Callable
-from pyvolution.types.gene import BaseType
+from attr import evolve
+from pyvolution.types.gene import BaseType, Chromosome
 from pyvolution.types.individual import Individual
 
 Mutator = Callable[[BaseType], BaseType]
 
 
+def mutate_chromosome(mutator: Mutator, chromosome: Chromosome) -> Chromosome:
+    """
+    :param mutator:
+    :param chromosome:
+    :return:
+    >>> chromosome = {0: 1, 1: 2}
+    >>> mutate_chromosome(lambda x: x**2, chromosome)
+    {0: 1, 1: 4}
+    >>> mutate_chromosome(abs, chromosome) is chromosome
+    True
+    """
+    mutated = tuple((p, mutator(base)) for (p, base) in chromosome.items())
+    if all(base == original for ((_, base), original) in zip(mutated, chromosome.values())):
+        return chromosome
+    return type(chromosome)(mutated)
+
+
 def mutate(mutator: Mutator, individual: Individual) -> Individual:
     """
+    Chromosomes left unchanged by the mutator are shared with the original individual instead of being copied.
     :param mutator:
     :param individual:
     :return:
     >>> member = Individual({0: [{0: 1, 1: 2}], 1: ({0: 3, 1:4},)}, 0, 'John doe')
     >>> mutate(lambda x: x**2, member)
-    Individual(karyogram={0: [{0: 1, 1: 4}], 1: ({0: 9, 1: 16},)}, generation=0, name='John doe')
+    Individual(karyogram={0: [{0: 1, 1: 4}], 1: ({0: 9, 1: 16},)}, generation=0, name='John doe', meta={})
+    >>> mutant = mutate(lambda x: x if x < 3 else -x, member)
+    >>> mutant.karyogram[0] is member.karyogram[0], mutant.karyogram[1][0] is member.karyogram[1][0]
+    (True, False)
     """
-
-    mutated = (
-        (
-            position,
-            type(chromosomes)(
-                type(chromosome)(
-                    (p, mutator(base)) for (p, base) in chromosome.items()
-                )
-                for chromosome in chromosomes
+    karyogram = individual.karyogram
+    mutated = tuple(
+        (position, chromosomes, tuple(mutate_chromosome(mutator, chromosome) for chromosome in chromosomes))
+        for (position, chromosomes) in karyogram.items()
+    )
+    if all(m is c for (_, chromosomes, mutants) in mutated for (m, c) in zip(mutants, chromosomes)):
+        return evolve(individual)
+    return evolve(
+        individual,
+        karyogram=type(karyogram)(
+            (
+                position,
+                chromosomes if all(m is c for (m, c) in zip(mutants, chromosomes)) else type(chromosomes)(mutants)
             )
+            for (position, chromosomes, mutants) in mutated
         )
-        for (position, chromosomes) in individual.karyogram.items()
     )
-    mutant = Individual(**vars(individual))
-    mutant.karyogram = type(individual.karyogram)(mutated)
-    return mutant
-
@@ -1,13 +1,36 @@
-from typing import Sequence
-from itertools import count
-from pyvolution.types.individual import Naming, NameType, Individual
+from typing import Sequence, Optional, Iterator
+from pyvolution.types.individual import Naming, NameType, Individual, Counter
+from pyvolution.types.genealogy import Genealogy
 
 
-def create_default_naming() -> Naming:
-    id_gen = count()
+def create_default_naming(counter: Optional[Counter]=None) -> Naming:
+    id_gen = counter if counter is not None else Counter()
     def default_naming(generation: int, parents: Sequence[Individual]) -> NameType:
         return dict(
             parents=[parent.name['id'] for parent in parents],
             id=next(id_gen)
         )
     return default_naming
+
+
+def create_genealogy_naming(genealogy: Genealogy, ids: Optional[Iterator[int]]=None) -> Naming:
+    """
+    :param genealogy:
+    :param ids:
+    :return:
+    >>> from pyvolution.types.individual import Individual
+    >>> genealogy = Genealogy()
+    >>> naming = create_genealogy_naming(genealogy)
+    >>> adam, eve = Individual({}, 0, naming(0, ())), Individual({}, 0, naming(0, ()))
+    >>> naming(1, (adam, eve))
+    2
+    >>> genealogy.children(adam.name)
+    [2]
+    """
+    id_gen = ids if ids else Counter()
+
+    def genealogy_naming(generation: int, parents: Sequence[Individual]) -> int:
+        identifier = next(id_gen)
+        genealogy.record(identifier, generation, [parent.name for parent in parents])
+        return identifier
+    return genealogy_naming
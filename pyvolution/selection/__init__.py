@@ -0,0 +1,220 @@
+from typing import Callable, Sequence, List, Tuple, Iterator
+from math import isfinite, floor
+from operator import itemgetter
+from pyvolution.types.individual import Individual
+from pyvolution.types.population import (
+    Fitness, FitnessFunction, Population, RankedPopulation, MateSelector, BatchMateSelector, Survival
+)
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM
+
+IndexSampler = Callable[[Sequence[Fitness], int], List[int]]
+AliasTable = Tuple[List[float], List[int]]
+
+
+def proportional_weights(fitness: Sequence[float]) -> List[float]:
+    """
+    Shifts the fitness values so that the worst finite one gets weight 0, infinitely bad ones (and NaN) are
+    never drawn. If no weight remains, all individuals are equally likely.
+    :param fitness:
+    :return:
+    >>> proportional_weights([-1.0, 1.0, -float('inf'), 3.0])
+    [0.0, 2.0, 0.0, 4.0]
+    >>> proportional_weights([2.0, 2.0])
+    [1.0, 1.0]
+    """
+    finite = [value for value in fitness if isfinite(value)]
+    if not finite:
+        return [1.0] * len(fitness)
+    lowest = min(finite)
+    weights = [value - lowest if isfinite(value) else 0.0 for value in fitness]
+    return weights if any(weights) else [1.0 if isfinite(value) else 0.0 for value in fitness]
+
+
+def build_alias_table(weights: Sequence[float]) -> AliasTable:
+    """
+    Vose's alias method: after this O(n) setup every draw costs O(1).
+    :param weights: non-negative, not all zero
+    :return:
+    >>> probabilities, aliases = build_alias_table([1.0, 3.0])
+    >>> probabilities, aliases
+    ([0.5, 1.0], [1, 1])
+    """
+    size = len(weights)
+    total = sum(weights)
+    scaled = [weight * size / total for weight in weights]
+    probabilities, aliases = [1.0] * size, list(range(size))
+    small = [index for (index, value) in enumerate(scaled) if value < 1.0]
+    large = [index for (index, value) in enumerate(scaled) if value >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probabilities[less], aliases[less] = scaled[less], more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    return probabilities, aliases
+
+
+def draw_alias(table: AliasTable, amount: int, rng: RandomSource=GLOBAL_RANDOM) -> List[int]:
+    """
+    :param table:
+    :param amount:
+    :param rng:
+    :return:
+    >>> draws = draw_alias(build_alias_table([0.0, 1.0, 3.0]), 4000)
+    >>> draws.count(0), 0.2 < draws.count(1) / 4000 < 0.3
+    (0, True)
+    """
+    probabilities, aliases = table
+    size = len(probabilities)
+    draws = list()
+    for value in (rng.random() * size for _ in range(amount)):
+        column = floor(value)
+        draws.append(column if value - column < probabilities[column] else aliases[column])
+    return draws
+
+
+def create_tournament_sampler(size: int=2, rng: RandomSource=GLOBAL_RANDOM) -> IndexSampler:
+    """
+    Every draw is the fittest of size uniformly chosen contestants; all contestants are drawn at once.
+    :param size:
+    :param rng:
+    :return:
+    >>> sample = create_tournament_sampler(5)
+    >>> sum(sample([0.0, 1.0, 2.0, 3.0], 1000)) / 1000 > 2.5
+    True
+    """
+    def sample(fitness: Sequence[Fitness], amount: int) -> List[int]:
+        contestants = rng.choices(range(len(fitness)), k=amount * size)
+        return [
+            max(contestants[start:start + size], key=fitness.__getitem__)
+            for start in range(0, amount * size, size)
+        ]
+    return sample
+
+
+def create_roulette_sampler(rng: RandomSource=GLOBAL_RANDOM) -> IndexSampler:
+    """
+    Fitness proportional selection on proportional_weights through an alias table built once per call.
+    :param rng:
+    :return:
+    >>> draws = create_roulette_sampler()([-float('inf'), 0.0, 1.0], 100)
+    >>> sorted(set(draws))
+    [2]
+    """
+    def sample(fitness: Sequence[float], amount: int) -> List[int]:
+        return draw_alias(build_alias_table(proportional_weights(fitness)), amount, rng) if fitness else list()
+    return sample
+
+
+def create_stochastic_universal_sampler(rng: RandomSource=GLOBAL_RANDOM) -> IndexSampler:
+    """
+    Stochastic universal sampling: amount equally spaced pointers with a single random offset, so every
+    individual is drawn within one of its expected number of times. The draws are shuffled for mating.
+    :param rng:
+    :return:
+    >>> sorted(create_stochastic_universal_sampler()([0.0, 2.0, 4.0, 6.0], 6))
+    [1, 2, 2, 3, 3, 3]
+    """
+    def sample(fitness: Sequence[float], amount: int) -> List[int]:
+        weights = proportional_weights(fitness)
+        if not weights or not amount:
+            return list()
+        step = sum(weights) / amount
+        pointer = rng.random() * step
+        draws, cumulated = list(), 0.0
+        for (index, weight) in enumerate(weights):
+            cumulated += weight
+            while pointer < cumulated and len(draws) < amount:
+                draws.append(index)
+                pointer += step
+        draws.extend(draws[-1:] * (amount - len(draws)))
+        rng.shuffle(draws)
+        return draws
+    return sample
+
+
+def create_rank_sampler(pressure: float=2.0, rng: RandomSource=GLOBAL_RANDOM) -> IndexSampler:
+    """
+    Linear ranking: the worst individual gets weight 2 - pressure, the best pressure (1 <= pressure <= 2).
+    :param pressure:
+    :param rng:
+    :return:
+    >>> draws = create_rank_sampler()([10.0, -5.0, 3.0], 3000)
+    >>> draws.count(1), draws.count(0) > draws.count(2)
+    (0, True)
+    """
+    def sample(fitness: Sequence[Fitness], amount: int) -> List[int]:
+        size = len(fitness)
+        if not size:
+            return list()
+        weights = [0.0] * size
+        for (rank, index) in enumerate(sorted(range(size), key=fitness.__getitem__)):
+            weights[index] = (2.0 - pressure) + 2.0 * (pressure - 1.0) * rank / max(size - 1, 1)
+        if not any(weights):
+            weights = [1.0] * size
+        return draw_alias(build_alias_table(weights), amount, rng)
+    return sample
+
+
+def create_index_mate_selector(
+        fitness: FitnessFunction,
+        sampler: IndexSampler,
+        parents: int=2
+) -> BatchMateSelector:
+    """
+    Evaluates the pool once and draws the parent indices of all children in a single call of the sampler.
+    :param fitness:
+    :param sampler:
+    :param parents:
+    :return:
+    >>> select = create_index_mate_selector(float, create_tournament_sampler(3))
+    >>> rows = select([0, 1, 2, 3], 5)
+    >>> len(rows), all(len(row) == 2 for row in rows)
+    (5, True)
+    """
+    def select_mates(pool: Sequence[Individual], children: int) -> List[Tuple[int, ...]]:
+        draws = sampler([fitness(individual) for individual in pool], children * parents)
+        return [tuple(draws[start:start + parents]) for start in range(0, len(draws), parents)]
+    return select_mates
+
+
+def create_mate_selector(fitness: FitnessFunction, sampler: IndexSampler, parents: int=2) -> MateSelector:
+    """
+    :param fitness:
+    :param sampler:
+    :param parents:
+    :return:
+    >>> from pyvolution.types.population import create_children_builder, create_sample_population
+    >>> from pyvolution.types.individual import create_birth_builder, create_gamete_builder, select_half, create_sequential_naming
+    >>> select = create_mate_selector(lambda i: 0.0, create_stochastic_universal_sampler())
+    >>> breed = create_children_builder(select, create_birth_builder(create_gamete_builder(select_half), create_sequential_naming()))
+    >>> len(list(breed(create_sample_population(6), 4, 1)))
+    4
+    """
+    select_indices = create_index_mate_selector(fitness, sampler, parents)
+
+    def select_mates(population: Population, children: int) -> Iterator[Sequence[Individual]]:
+        pool = tuple(population)
+        return (tuple(pool[index] for index in row) for row in select_indices(pool, children))
+    return select_mates
+
+
+def create_selection_survival(
+        sampler: IndexSampler,
+        survivors: Callable[[int], int]=lambda size: size // 2
+) -> Survival:
+    """
+    Survival by drawing survivors(len(population)) times; individuals drawn more than once survive once.
+    :param sampler:
+    :param survivors:
+    :return:
+    >>> survival = create_selection_survival(create_tournament_sampler(4))
+    >>> ranked = [('i{0}'.format(i), float(i)) for i in range(100)]
+    >>> survived = survival(ranked)
+    >>> 0 < len(survived) <= 50, sum(fitness for (_, fitness) in survived) / len(survived) > 50.0
+    (True, True)
+    """
+    def determine_survivors(population: RankedPopulation) -> RankedPopulation:
+        ranked = list(population)
+        draws = sampler(list(map(itemgetter(1), ranked)), survivors(len(ranked)))
+        return [ranked[index] for index in dict.fromkeys(draws)]
+    return determine_survivors
@@ -1,5 +1,13 @@
+from typing import Sequence, List, Tuple
 from math import ceil
-from pyvolution.types.population import Fitness, SurvivalIndication, RankedPopulation
+from heapq import nlargest
+from itertools import compress
+from operator import itemgetter, le
+from functools import partial
+from pyvolution.types.individual import Individual
+from pyvolution.types.population import Fitness, SurvivalIndication, RankedPopulation, Survival
+
+PARTIAL_SELECTION_RATIO = 16
 
 
 def create_threshold_indication(threshold: Fitness) -> SurvivalIndication:
@@ -8,6 +16,69 @@ def create_threshold_indication(threshold: Fitness) -> SurvivalIndication:
     return threshold_indication
 
 
+def select_best(population: Sequence[Tuple[Individual, Fitness]], amount: int) -> List[Tuple[Individual, Fitness]]:
+    """
+    The amount fittest members, best first. Small amounts are picked by partial selection with a heap,
+    larger ones by sorting, whichever is faster.
+    :param population:
+    :param amount:
+    :return:
+    >>> ranked = [(name, fitness) for (name, fitness) in zip('abcdefghijklmnopqrstuvwxyz', range(26))]
+    >>> select_best(ranked, 3), select_best(ranked, 20)[-1]
+    ([('z', 25), ('y', 24), ('x', 23)], ('g', 6))
+    """
+    if amount * PARTIAL_SELECTION_RATIO < len(population):
+        return nlargest(amount, population, key=itemgetter(1))
+    return sorted(population, key=itemgetter(1), reverse=True)[:amount]
+
+
+def keep_best(amount: int) -> Survival:
+    """
+    :param amount:
+    :return:
+    >>> keep_best(2)([('a', 1.0), ('b', 3.0), ('c', 2.0)])
+    [('b', 3.0), ('c', 2.0)]
+    """
+    def determine_survivors(population: RankedPopulation) -> RankedPopulation:
+        return select_best(list(population), amount)
+    return determine_survivors
+
+
+def keep_best_ratio(ratio: float) -> Survival:
+    """
+    Truncation selection keeping the best ratio of the population, rounded up.
+    :param ratio:
+    :return:
+    >>> [name for (name, _) in keep_best_ratio(0.1)([(i, -i) for i in range(25)])]
+    [0, 1, 2]
+    """
+    def determine_survivors(population: RankedPopulation) -> RankedPopulation:
+        ranked = list(population)
+        return select_best(ranked, ceil(len(ranked) * ratio))
+    return determine_survivors
+
+
 def keep_best_halve(population: RankedPopulation) -> RankedPopulation:
-    ranking = sorted(population, key=lambda x: x[1], reverse=True)
-    return ranking[0: ceil(len(ranking) // 2)]
+    """
+    :param population:
+    :return:
+    >>> keep_best_halve([('a', 1.0), ('b', 3.0), ('c', 2.0)])
+    [('b', 3.0), ('c', 2.0)]
+    """
+    ranked = list(population)
+    return select_best(ranked, ceil(len(ranked) / 2))
+
+
+def create_threshold_survival(threshold: Fitness) -> Survival:
+    """
+    Keeps the members whose fitness reaches the threshold, in their original order. The comparison runs over
+    the fitness column in a single map.
+    :param threshold:
+    :return:
+    >>> create_threshold_survival(2.0)([('a', 1.0), ('b', 3.0), ('c', 2.0)])
+    [('b', 3.0), ('c', 2.0)]
+    """
+    def determine_survivors(population: RankedPopulation) -> RankedPopulation:
+        ranked = list(population)
+        return list(compress(ranked, map(partial(le, threshold), map(itemgetter(1), ranked))))
+    return determine_survivors
@@ -1,4 +1,4 @@
-from typing import TypeVar, Sequence, Callable, Optional, Mapping, MutableMapping, Iterable, Tuple
+from typing import TypeVar, Sequence, Callable, Optional, Mapping, MutableMapping, Iterable, Iterator, Tuple, Any, List
 from functools import reduce
 from operator import add
 from itertools import groupby, chain
@@ -29,10 +29,68 @@ ReverseTranscription = Callable[[Sequence[GeneType]], DataType]
 Karyogram = Mapping[int, Sequence[Chromosome]]
 Dominance = Callable[[Iterable[GeneType]], GeneType]
 KaryoTranscription = Callable[[DataType], Mapping[int, Chromosome]]
+BulkKaryoTranscription = Callable[[Sequence[DataType]], Sequence[Mapping[int, Chromosome]]]
 Crossover = Callable[[Karyogram], Karyogram]
+BatchCrossover = Callable[[Sequence[Karyogram]], Sequence[Karyogram]]
 Anomaly = Callable[[Karyogram], Karyogram]
 
 
+class FrozenChromosome(Mapping):
+    """
+    Immutable chromosome. Since no operator can modify a frozen chromosome in place, children, gametes and
+    survivors reference the chromosomes of their ancestors until an operator actually changes them.
+    >>> chromosome = FrozenChromosome(enumerate('ACGT'))
+    >>> chromosome[2]
+    'G'
+    >>> chromosome == {0: 'A', 1: 'C', 2: 'G', 3: 'T'}
+    True
+    >>> chromosome
+    FrozenChromosome({0: 'A', 1: 'C', 2: 'G', 3: 'T'})
+    >>> reordered = FrozenChromosome([(3, 'T'), (2, 'G'), (1, 'C'), (0, 'A')])
+    >>> reordered == chromosome, hash(reordered) == hash(chromosome), len({chromosome, reordered})
+    (True, True, 1)
+    >>> chromosome[0] = 'T'
+    Traceback (most recent call last):
+    ...
+    TypeError: 'FrozenChromosome' object does not support item assignment
+    """
+    __slots__ = ('_genes', '_hash')
+
+    def __init__(self, genes: Iterable[Tuple[int, GeneType]]=tuple()):
+        self._genes = dict(genes)
+        self._hash = None
+
+    def __getitem__(self, position: int) -> GeneType:
+        return self._genes[position]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._genes)
+
+    def __len__(self) -> int:
+        return len(self._genes)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            # equality ignores the order of the genes, and so has the hash
+            self._hash = hash(frozenset(self._genes.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return '{0}({1!r})'.format(type(self).__name__, self._genes)
+
+    def __reduce__(self) -> Tuple[type, Tuple[Any, ...]]:
+        return type(self), (self._genes,)
+
+    def keys(self):
+        return self._genes.keys()
+
+    def values(self):
+        return self._genes.values()
+
+    def items(self):
+        return self._genes.items()
+
+
 def default_reduction(bases: Sequence[BaseType]) -> BaseType:
     return reduce(add, bases[1:], bases[0])
 
@@ -116,6 +174,42 @@ def create_crossover(
 
 
 
+def batch_crossover(xover: Crossover) -> BatchCrossover:
+    """
+    Applies a single karyogram crossover to every gamete of a batch.
+    :param xover:
+    :return:
+    >>> batch_crossover(lambda k: dict((p, cs[::-1]) for (p, cs) in k.items()))([{0: (1, 2)}, {0: (3, 4)}])
+    [{0: (2, 1)}, {0: (4, 3)}]
+    """
+    def apply_batch_crossover(karyograms: Sequence[Karyogram]) -> Sequence[Karyogram]:
+        return list(map(xover, karyograms))
+    return apply_batch_crossover
+
+
+def freeze_karyogram(karyogram: Karyogram) -> Karyogram:
+    """
+    :param karyogram:
+    :return:
+    >>> karyogram = {0: ({0: 1, 1: 2}, FrozenChromosome({0: 3, 1: 4}))}
+    >>> frozen = freeze_karyogram(karyogram)
+    >>> frozen
+    {0: (FrozenChromosome({0: 1, 1: 2}), FrozenChromosome({0: 3, 1: 4}))}
+    >>> frozen[0][1] is karyogram[0][1]
+    True
+    """
+    return type(karyogram)(
+        (
+            position,
+            type(chromosomes)(
+                chromosome if isinstance(chromosome, FrozenChromosome) else FrozenChromosome(chromosome.items())
+                for chromosome in chromosomes
+            )
+        )
+        for (position, chromosomes) in karyogram.items()
+    )
+
+
 def merge_chromosome_sets(sets: Sequence[ChromosomeSet]) -> Karyogram:
     # noinspection PyTypeChecker
     """
@@ -190,24 +284,63 @@ def create_linear_mapping(
     return linear_mapping, linear_remapping
 
 
+def fill_chromosome_gaps(
+        chromosome: Chromosome,
+        length: int,
+        create_chromosome: Callable[[None], Chromosome]=dict,
+        handle_gap: Callable[[int], BaseType]=lambda pos: None
+) -> Chromosome:
+    """
+    Fills the gene positions 0..length-1 missing in the chromosome, keeping the genes in position order.
+    :param chromosome:
+    :param length:
+    :param create_chromosome:
+    :param handle_gap:
+    :return:
+    >>> fill_chromosome_gaps({0: 'a', 2: 'c'}, 4, handle_gap=lambda pos: '_')
+    {0: 'a', 1: '_', 2: 'c', 3: '_'}
+    """
+    if len(chromosome) == length and max(chromosome, default=-1) < length:
+        return chromosome
+    filled = create_chromosome()
+    filled.update(
+        (position, chromosome[position] if position in chromosome else handle_gap(position))
+        for position in range(length)
+    )
+    filled.update((position, gene) for (position, gene) in chromosome.items() if position >= length)
+    return filled
+
+
 def create_chromosome_builder(
         transcription: Transcription,
         mapping: GeneMapping,
         create_chromosome: Callable[[None], Chromosome]=dict,
-        handle_gap: [Callable[[int], BaseType]]=lambda pos: None
+        handle_gap: [Callable[[int], BaseType]]=lambda pos: None,
+        frozen: bool=False,
+        chromosome_size: Optional[int]=None
 ) -> KaryoTranscription:
     # noinspection PyTypeChecker
     """
+        Positions missing inside a chromosome are filled by handle_gap; with a chromosome_size every chromosome
+        is filled up to that size.
         :param transcription:
         :param mapping:
         :param encoding:
         :param create_chromosome:
         :param handle_gap:
+        :param frozen:
+        :param chromosome_size:
         :return:
         >>> mapping, remapping = create_linear_mapping(4)
         >>> builder = create_chromosome_builder(list, mapping, handle_gap=lambda x: b'G')
         >>> repr(dict(builder("Hello World!"))).replace(' ', '')
         "{0:{0:'H',1:'e',2:'l',3:'l'},1:{0:'o',1:'',2:'W',3:'o'},2:{0:'r',1:'l',2:'d',3:'!'}}"
+        >>> builder = create_chromosome_builder(list, mapping, frozen=True)
+        >>> builder("Hello")[1]
+        FrozenChromosome({0: 'o'})
+        >>> builder = create_chromosome_builder(list, mapping, handle_gap=lambda x: '_', chromosome_size=4)
+        >>> builder("Hello")[1]
+        {0: 'o', 1: '_', 2: '_', 3: '_'}
         """
     def build_chromosome_set(data: DataType) -> ChromosomeSet:
         karyogram = defaultdict(create_chromosome)
@@ -215,9 +348,57 @@ def create_chromosome_builder(
         for (i, gene) in enumerate(genes):
             chromosome, position = mapping(i)
             karyogram[chromosome][position] = gene
-        for chromosome in karyogram.values():
-            gaps = set(range(max(karyogram.keys()))).difference(karyogram.keys())
-            for gap in gaps:
-                chromosome[gap] = handle_gap(gap)
+        for (index, chromosome) in karyogram.items():
+            length = chromosome_size if chromosome_size is not None else max(chromosome.keys(), default=-1) + 1
+            karyogram[index] = fill_chromosome_gaps(chromosome, length, create_chromosome, handle_gap)
+        if frozen:
+            for (index, chromosome) in karyogram.items():
+                karyogram[index] = FrozenChromosome(chromosome.items())
         return karyogram
     return build_chromosome_set
+
+
+def create_bulk_chromosome_builder(
+        transcription: Transcription,
+        chromosome_size: int,
+        create_chromosome: Callable[[None], Chromosome]=dict,
+        handle_gap: Callable[[int], BaseType]=lambda pos: None,
+        frozen: bool=False
+) -> BulkKaryoTranscription:
+    """
+    Builds the chromosome sets of many data items in one call for the linear mapping of the given chromosome
+    size: genes are cut into chromosome sized slices and the last slice is padded by handle_gap.
+    :param transcription:
+    :param chromosome_size:
+    :param create_chromosome:
+    :param handle_gap:
+    :param frozen:
+    :return:
+    >>> mapping, remapping = create_linear_mapping(4)
+    >>> single = create_chromosome_builder(list, mapping, handle_gap=lambda x: '_', chromosome_size=4)
+    >>> bulk = create_bulk_chromosome_builder(list, 4, handle_gap=lambda x: '_')
+    >>> bulk(['Hello World!', 'Hi']) == [single('Hello World!'), single('Hi')]
+    True
+    """
+    padding = [handle_gap(position) for position in range(chromosome_size)]
+
+    def build(genes: Sequence[GeneType]) -> Chromosome:
+        if frozen:
+            return FrozenChromosome(enumerate(genes))
+        chromosome = create_chromosome()
+        chromosome.update(enumerate(genes))
+        return chromosome
+
+    def build_chromosome_sets(data: Sequence[DataType]) -> List[ChromosomeSet]:
+        chromosome_sets = list()
+        for item in data:
+            genes = list(transcription(item))
+            genes.extend(padding[len(genes) % chromosome_size or chromosome_size:])
+            chromosome_sets.append(
+                dict(
+                    (index, build(genes[start:start + chromosome_size]))
+                    for (index, start) in enumerate(range(0, len(genes), chromosome_size))
+                )
+            )
+        return chromosome_sets
+    return build_chromosome_sets
@@ -0,0 +1,96 @@
+from typing import Dict, List, Sequence, Iterable, Iterator, Callable
+from array import array
+from collections import deque
+from attr import attrs, attrib, Factory
+
+
+@attrs
+class Genealogy:
+    """
+    Columnar record of who descends from whom. Row i holds ids[i], generations[i] and the parent ids
+    parent_ids[parent_offsets[i]:parent_offsets[i+1]], while offspring indexes children by parent id.
+    >>> genealogy = Genealogy()
+    >>> for (identifier, generation, parents) in [(0, 0, ()), (1, 0, ()), (2, 1, (0, 1)), (3, 2, (2, 1)), (4, 2, (1,))]:
+    ...     genealogy.record(identifier, generation, parents)
+    >>> len(genealogy)
+    5
+    >>> list(genealogy.parents(3)), genealogy.children(1)
+    ([2, 1], [2, 3, 4])
+    >>> sorted(genealogy.descendants(0)), sorted(genealogy.ancestors(3))
+    ([2, 3], [0, 1, 2])
+    """
+    ids: array = attrib(default=Factory(lambda: array('q')))
+    generations: array = attrib(default=Factory(lambda: array('q')))
+    parent_offsets: array = attrib(default=Factory(lambda: array('q', [0])))
+    parent_ids: array = attrib(default=Factory(lambda: array('q')))
+    rows: Dict[int, int] = attrib(default=Factory(dict), repr=False)
+    offspring: Dict[int, List[int]] = attrib(default=Factory(dict), repr=False)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, identifier: int) -> bool:
+        return identifier in self.rows
+
+    def record(self, identifier: int, generation: int, parents: Sequence[int]) -> None:
+        self.rows[identifier] = len(self.ids)
+        self.ids.append(identifier)
+        self.generations.append(generation)
+        self.parent_ids.extend(parents)
+        self.parent_offsets.append(len(self.parent_ids))
+        for parent in parents:
+            self.offspring.setdefault(parent, []).append(identifier)
+
+    def generation(self, identifier: int) -> int:
+        return self.generations[self.rows[identifier]]
+
+    def parents(self, identifier: int) -> Sequence[int]:
+        row = self.rows[identifier]
+        return self.parent_ids[self.parent_offsets[row]:self.parent_offsets[row + 1]]
+
+    def children(self, identifier: int) -> Sequence[int]:
+        return self.offspring.get(identifier, [])
+
+    def descendants(self, identifier: int) -> List[int]:
+        return traverse(identifier, self.children)
+
+    def ancestors(self, identifier: int) -> List[int]:
+        return traverse(identifier, lambda i: self.parents(i) if i in self.rows else ())
+
+    def rows_since(self, start: int) -> Iterator[Sequence[int]]:
+        for row in range(start, len(self.ids)):
+            parents = self.parent_ids[self.parent_offsets[row]:self.parent_offsets[row + 1]]
+            yield (self.ids[row], self.generations[row], len(parents), *parents)
+
+
+def traverse(identifier: int, relatives: Callable[[int], Iterable[int]]) -> List[int]:
+    """
+    :param identifier:
+    :param relatives:
+    :return:
+    >>> traverse(0, {0: [1, 2], 1: [3], 2: [3], 3: []}.get)
+    [1, 2, 3]
+    """
+    found = list()
+    seen = {identifier}
+    pending = deque([identifier])
+    while pending:
+        for relative in relatives(pending.popleft()):
+            if relative not in seen:
+                seen.add(relative)
+                found.append(relative)
+                pending.append(relative)
+    return found
+
+
+def build_genealogy(records: Iterable[Sequence[int]]) -> Genealogy:
+    """
+    :param records:
+    :return:
+    >>> build_genealogy([(0, 0, 0), (1, 1, 1, 0)]).children(0)
+    [1]
+    """
+    genealogy = Genealogy()
+    for record in records:
+        genealogy.record(record[0], record[1], record[3:3 + record[2]])
+    return genealogy
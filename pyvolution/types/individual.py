@@ -1,8 +1,11 @@
-from typing import TypeVar, Callable, Sequence, Iterator, Optional, Tuple, Any, Dict, Optional, Generator
-from random import choice
-from itertools import groupby, count
+from typing import TypeVar, Callable, Sequence, Iterator, Optional, Tuple, Any, Dict, Optional, Generator, List, Iterable
+from itertools import groupby, islice
+from functools import partial
 from attr import attrs, attrib, Factory
-from pyvolution.types.gene import DataType, Chromosome, KaryoTranscription, Karyogram, Crossover, Anomaly, GeneType
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM
+from pyvolution.types.gene import (
+    DataType, Chromosome, KaryoTranscription, BulkKaryoTranscription, Karyogram, Crossover, BatchCrossover, Anomaly, GeneType
+)
 
 NameType = TypeVar('NameType')
 
@@ -15,13 +18,62 @@ class Individual:
     meta: Dict[str, Any] = attrib(default=Factory(dict))
 
 
+@attrs(slots=True)
+class CompactIndividual:
+    """
+    Slotted individual for large populations and stored histories. The name is expected to be an integer id,
+    parents are kept as a tuple of ids and meta is only allocated once it is accessed.
+    >>> individual = CompactIndividual({0: ({0: 1},)}, 3, 7, parents=(1, 2))
+    >>> individual
+    CompactIndividual(karyogram={0: ({0: 1},)}, generation=3, name=7, parents=(1, 2), fitness=None)
+    >>> hasattr(individual, '__dict__')
+    False
+    >>> individual.meta['origin'] = 'lab'
+    >>> individual.meta
+    {'origin': 'lab'}
+    """
+    karyogram: Karyogram = attrib()
+    generation: int = attrib()
+    name: Optional[int] = attrib(default=None)
+    _meta: Optional[Dict[str, Any]] = attrib(default=None, repr=False)
+    parents: Tuple[int, ...] = attrib(default=tuple(), converter=tuple)
+    fitness: Optional[Any] = attrib(default=None)
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        if self._meta is None:
+            self._meta = dict()
+        return self._meta
+
+
+@attrs
+class Counter:
+    """
+    Drop-in replacement for itertools.count whose position can be captured and restored, e.g. by checkpoints.
+    >>> counter = Counter(5)
+    >>> next(counter), next(counter), counter.value
+    (5, 6, 7)
+    """
+    value: int = attrib(default=0)
+
+    def __iter__(self) -> 'Counter':
+        return self
+
+    def __next__(self) -> int:
+        self.value += 1
+        return self.value - 1
+
+
 Spawning = Callable[[Iterator[DataType], int], Individual]
+BatchSpawning = Callable[[Sequence[DataType], int, int], List[Individual]]
 Naming = Callable[[int, Sequence[Individual]], NameType]
 Selector = Callable[[Karyogram], Karyogram]
 Gamete = Karyogram
 Mitosis = Callable[[Individual], Gamete]
 Birthing = Callable[[Sequence[Individual], int], Individual]
 Merging = Callable[[Iterator[Karyogram]], Karyogram]
+BatchSelector = Callable[[Sequence[Karyogram]], List[Gamete]]
+BatchBirthing = Callable[[Sequence[Individual], Sequence[Sequence[int]], int], List[Individual]]
 
 
 
@@ -31,7 +83,8 @@ def create_sample_individual(
         gene_space: Sequence[GeneType]=tuple(range(10)),
         chromosome_length: int=10,
         name: str='Samplus Primus',
-        generation: int=0
+        generation: int=0,
+        rng: RandomSource=GLOBAL_RANDOM
 ) -> Individual:
     """
     :param size:
@@ -40,17 +93,17 @@ def create_sample_individual(
     :param chromosome_length:
     :param name:
     :param generation:
+    :param rng:
     :return:
     >>> create_sample_individual(2, 2)
     """
+    genes = iter(rng.choices(gene_space, k=size * haplodity * chromosome_length))
     return Individual(
         dict(
             (
                 index,
                 [
-                    dict(
-                        (gindex, choice(gene_space)) for gindex in range(chromosome_length)
-                    )
+                    dict(zip(range(chromosome_length), genes))
                     for _ in range(haplodity)
                 ]
             )
@@ -61,11 +114,11 @@ def create_sample_individual(
     )
 
 
-
-
-
-def create_sequential_naming(converter: Optional[Callable[[int], NameType]]=None) -> Naming:
-    gen = count()
+def create_sequential_naming(
+        converter: Optional[Callable[[int], NameType]]=None,
+        counter: Optional[Counter]=None
+) -> Naming:
+    gen = counter if counter is not None else Counter()
     converter = converter if converter else lambda x: x
 
     def sequential_naming(generation: int, parents: Sequence[Individual]) -> NameType:
@@ -84,6 +137,8 @@ def merge_karyograms(
         payload_handler: Callable[[Iterator[Chromosome]], Sequence[Chromosome]]=tuple
 ) -> Karyogram:
     """
+    Karyograms sharing the same positions (the usual case of gametes from a fixed-shape population) are merged
+    position by position in linear time, ragged ones with merge_ragged_karyograms.
     :param karyograms:
     :param karyo_handler:
     :param payload_handler:
@@ -98,7 +153,26 @@ def merge_karyograms(
     ... }
     >>> merge_karyograms((left, right)) # doctest: +ELLIPSIS
     {0: ({0: b'A', 1: b'A'}, {0: b'C', 1: b'C'}), 1: ({0: b'B', 1: b'B'}, {0: b'D', 1: b'D'})}
+    >>> merge_karyograms(({1: ('b',)}, {0: ('c',), 1: ('d',)}))
+    {0: ('c',), 1: ('b', 'd')}
     """
+    karyograms = tuple(karyograms)
+    if not karyograms:
+        return karyo_handler(iter(()))
+    positions = karyograms[0].keys()
+    if any(karyogram.keys() != positions for karyogram in karyograms[1:]):
+        return merge_ragged_karyograms(karyograms, karyo_handler, payload_handler)
+    return karyo_handler(
+        (pos, payload_handler(chromosome for karyogram in karyograms for chromosome in karyogram[pos]))
+        for pos in sorted(positions)
+    )
+
+
+def merge_ragged_karyograms(
+        karyograms: Iterable[Karyogram],
+        karyo_handler: Callable[[Iterator[Tuple[int, Iterator[Chromosome]]]], Karyogram]=dict,
+        payload_handler: Callable[[Iterator[Chromosome]], Sequence[Chromosome]]=tuple
+) -> Karyogram:
     genetic_payload = sorted(
         (
             (pos, (chromosome for chromosome in chromosomes))
@@ -117,13 +191,16 @@ def create_individual_builder(
         naming: Naming,
         karyo_handler: Callable[[Iterator[Tuple[int, Iterator[Chromosome]]]], Karyogram]=dict,
         payload_handler: Callable[[Iterator[Chromosome]], Sequence[Chromosome]]=tuple,
-        xover: Crossover=lambda x: x
+        xover: Crossover=lambda x: x,
+        individual_type: Callable[..., Individual]=Individual
 ) -> Spawning:
     """
     :param karyo_handler:
     :param payload_handler:
     :param transcription:
     :param naming:
+    :param xover:
+    :param individual_type:
     :return:
     >>> from pyvolution.types.gene import create_linear_mapping, create_chromosome_builder
     >>> mapping, remapping = create_linear_mapping(4)
@@ -136,27 +213,99 @@ def create_individual_builder(
     0
     >>> creature.karyogram # doctest: +ELLIPSIS
     {0: ({0: 'H', 1: 'e', 2: 'l', 3: 'l'}, {0: 'W', 1: 'o', 2: 'r', 3: 'l'}), 1: ({0: 'o'}, {0: 'd'})}
+    >>> spawner = create_individual_builder(builder, create_sequential_naming(), individual_type=CompactIndividual)
+    >>> spawner(('Hello', 'World'), 0).parents
+    ()
     """
     def spawn_individual(data: Iterator[DataType], generation: int) -> Individual:
-        payload = sorted(
-            ((pos, chromosome) for x in data for (pos, chromosome) in transcription(x).items()), key=lambda x: x[0]
-        )
-        karyogram = karyo_handler(
-            (pos, payload_handler(chromosome[1] for chromosome in chromosomes))
-            for (pos, chromosomes) in groupby(payload, key=lambda x: x[0])
-        )
-
-        return Individual(
-            karyogram=xover(karyogram),
+        return individual_type(
+            karyogram=xover(assemble_karyogram(map(transcription, data), karyo_handler, payload_handler)),
             generation=generation,
             name=naming(generation, tuple())
         )
     return spawn_individual
 
 
-def select_half(karyogram: Karyogram) -> Karyogram:
+def assemble_karyogram(
+        chromosome_sets: Iterable[Dict[int, Chromosome]],
+        karyo_handler: Callable[[Iterator[Tuple[int, Iterator[Chromosome]]]], Karyogram]=dict,
+        payload_handler: Callable[[Iterator[Chromosome]], Sequence[Chromosome]]=tuple
+) -> Karyogram:
+    """
+    Collects the chromosomes of several chromosome sets by karyogram position, keeping the order of the sets.
+    :param chromosome_sets:
+    :param karyo_handler:
+    :param payload_handler:
+    :return:
+    >>> assemble_karyogram([{1: 'b', 0: 'a'}, {0: 'c'}])
+    {0: ('a', 'c'), 1: ('b',)}
+    """
+    positions: Dict[int, List[Chromosome]] = dict()
+    for chromosome_set in chromosome_sets:
+        for (position, chromosome) in chromosome_set.items():
+            positions.setdefault(position, []).append(chromosome)
+    return karyo_handler(
+        (position, payload_handler(positions[position])) for position in sorted(positions)
+    )
+
+
+def create_batch_individual_builder(
+        transcription: KaryoTranscription,
+        naming: Naming,
+        karyo_handler: Callable[[Iterator[Tuple[int, Iterator[Chromosome]]]], Karyogram]=dict,
+        payload_handler: Callable[[Iterator[Chromosome]], Sequence[Chromosome]]=tuple,
+        xover: Crossover=lambda x: x,
+        individual_type: Callable[..., Individual]=Individual,
+        bulk_transcription: Optional[BulkKaryoTranscription]=None
+) -> BatchSpawning:
+    """
+    Batch counterpart of create_individual_builder: spawns amount individuals from the flat data of a whole
+    population (as produced by a batch entropy source), every individual receiving len(data) // amount items.
+    :param transcription:
+    :param naming:
+    :param karyo_handler:
+    :param payload_handler:
+    :param xover:
+    :param individual_type:
+    :param bulk_transcription: transcribes all data at once, e.g. create_bulk_chromosome_builder, instead of
+        transcription
+    :return:
+    >>> from pyvolution.types.gene import create_linear_mapping, create_chromosome_builder
+    >>> mapping, remapping = create_linear_mapping(4)
+    >>> builder = create_chromosome_builder(list, mapping, handle_gap=lambda x: b'')
+    >>> single = create_individual_builder(builder, create_sequential_naming())
+    >>> batch = create_batch_individual_builder(builder, create_sequential_naming())
+    >>> individuals = batch(('Hello', 'World', 'Brave', 'New'), 2, 0)
+    >>> [i.name for i in individuals]
+    [0, 1]
+    >>> [i.karyogram for i in individuals] == [single(('Hello', 'World'), 0).karyogram, single(('Brave', 'New'), 0).karyogram]
+    True
+    >>> from pyvolution.types.gene import create_bulk_chromosome_builder
+    >>> transcription = create_bulk_chromosome_builder(list, 4, handle_gap=lambda x: '.')
+    >>> bulk = create_batch_individual_builder(None, create_sequential_naming(), bulk_transcription=transcription)
+    >>> bulk(('Hello', 'World'), 1, 0)[0].karyogram[1]
+    ({0: 'o', 1: '.', 2: '.', 3: '.'}, {0: 'd', 1: '.', 2: '.', 3: '.'})
+    """
+    def spawn_individuals(data: Sequence[DataType], amount: int, generation: int) -> List[Individual]:
+        length = len(data) // amount if amount else 0
+        chromosome_sets = bulk_transcription(data) if bulk_transcription else list(map(transcription, data))
+        return [
+            individual_type(
+                karyogram=xover(
+                    assemble_karyogram(chromosome_sets[row * length:(row + 1) * length], karyo_handler, payload_handler)
+                ),
+                generation=generation,
+                name=naming(generation, tuple())
+            )
+            for row in range(amount)
+        ]
+    return spawn_individuals
+
+
+def select_half(karyogram: Karyogram, rng: RandomSource=GLOBAL_RANDOM) -> Karyogram:
     """
     :param karyogram:
+    :param rng:
     :return
     >>> k = {
     ...     0: ({0: b'H', 1: b'e', 2: b'l', 3: b'l'}, {0: b'W', 1: b'o', 2: b'r', 3: b'l'}),
@@ -171,11 +320,39 @@ def select_half(karyogram: Karyogram) -> Karyogram:
     {}
     """
     return type(karyogram)(
-        (pos, type(chromosomes)(choice(chromosomes) for _ in range(len(chromosomes) // 2)))
+        (pos, type(chromosomes)(rng.choices(chromosomes, k=len(chromosomes) // 2)))
         for (pos, chromosomes) in karyogram.items()
     )
 
 
+def select_halves(karyograms: Sequence[Karyogram], rng: RandomSource=GLOBAL_RANDOM) -> List[Gamete]:
+    """
+    Batch counterpart of select_half: the chromosome indices of all gametes are drawn up front, with one
+    call per distinct number of chromosomes at a position.
+    :param karyograms:
+    :param rng:
+    :return:
+    >>> k = {0: ({0: 'a'}, {0: 'b'}), 1: ({0: 'c'}, {0: 'd'}, {0: 'e'}, {0: 'f'})}
+    >>> gametes = select_halves([k, k, k])
+    >>> [len(g[0]) for g in gametes], [len(g[1]) for g in gametes]
+    ([1, 1, 1], [2, 2, 2])
+    >>> all(c in k[p] for g in gametes for (p, cs) in g.items() for c in cs)
+    True
+    """
+    sizes = [len(chromosomes) for karyogram in karyograms for chromosomes in karyogram.values()]
+    draws = dict(
+        (count, iter(rng.choices(range(count), k=sizes.count(count) * (count // 2)))) for count in set(sizes)
+    )
+    gametes = list()
+    for karyogram in karyograms:
+        gamete = dict()
+        for (pos, chromosomes) in karyogram.items():
+            draw = draws[len(chromosomes)]
+            gamete[pos] = type(chromosomes)([chromosomes[next(draw)] for _ in range(len(chromosomes) // 2)])
+        gametes.append(gamete if type(karyogram) is dict else type(karyogram)(gamete))
+    return gametes
+
+
 def create_gamete_builder(selector: Selector, xover: Crossover=lambda x: x) -> Mitosis:
     def create_gamete(individual: Individual) -> Gamete:
         return xover(selector(individual.karyogram))
@@ -188,12 +365,17 @@ def create_birth_builder(
         merge: Merging=merge_karyograms,
         xover: Crossover=lambda x: x,
         anomaly: Anomaly=lambda x: x,
-        meta_id: Optional[Generator[int, None, None]]=None
+        meta_id: Optional[Counter]=None,
+        individual_type: Callable[..., Individual]=Individual
 ) -> Birthing:
     """
     :param mitosis:
     :param naming:
     :param merge:
+    :param xover:
+    :param anomaly:
+    :param meta_id:
+    :param individual_type: CompactIndividual children keep the names of their parents instead of a meta id
     :return:
     >>> from pyvolution.types.gene import create_linear_mapping, create_chromosome_builder
     >>> mapping, remapping = create_linear_mapping(4)
@@ -211,13 +393,82 @@ def create_birth_builder(
     ...     results.append(two in [('CCCC', 'DDDD'), ('CCCC', 'dddd'), ('cccc', 'DDDD'), ('cccc', 'dddd')])
     >>> all(results)
     True
+    >>> naming = create_sequential_naming()
+    >>> spawner = create_individual_builder(builder, naming, individual_type=CompactIndividual)
+    >>> birth = create_birth_builder(mitosis, naming, individual_type=CompactIndividual)
+    >>> child = birth((spawner(('AAAA', 'aaaa'), 0), spawner(('BBBB', 'bbbb'), 0)), 1)
+    >>> child.name, child.generation, child.parents
+    (2, 1, (0, 1))
     """
-    meta_id = meta_id if meta_id else count()
+    meta_id = meta_id if meta_id is not None else Counter()
+    compact = isinstance(individual_type, type) and issubclass(individual_type, CompactIndividual)
     def give_birth(parents: Sequence[Individual], generation: int) -> Individual:
-        return Individual(
-            karyogram=anomaly(merge(xover(mitosis(parent)) for parent in parents)),
-            generation=generation,
-            name=naming(generation, parents),
-            meta=dict(id=next(meta_id))
-        )
+        karyogram = anomaly(merge(xover(mitosis(parent)) for parent in parents))
+        name = naming(generation, parents)
+        if compact:
+            return individual_type(karyogram, generation, name, parents=tuple(parent.name for parent in parents))
+        return individual_type(karyogram=karyogram, generation=generation, name=name, meta=dict(id=next(meta_id)))
     return give_birth
+
+
+def create_batch_birth_builder(
+        naming: Naming,
+        merge: Merging=merge_karyograms,
+        xover: BatchCrossover=lambda gametes: gametes,
+        anomaly: Anomaly=lambda x: x,
+        select: Optional[BatchSelector]=None,
+        rng: RandomSource=GLOBAL_RANDOM,
+        meta_id: Optional[Counter]=None,
+        individual_type: Callable[..., Individual]=Individual
+) -> BatchBirthing:
+    """
+    Produces all children of a generation at once. The parents of every child are given as a row of indices
+    into the pool; the gametes of all children are selected in one pass and handed to the crossover as a
+    single batch. Children are built like those of create_birth_builder with the same individual_type.
+    :param naming:
+    :param merge:
+    :param xover:
+    :param anomaly:
+    :param select: batch gamete selection, select_halves drawing from rng by default
+    :param rng:
+    :param meta_id:
+    :param individual_type: CompactIndividual children keep the names of their parents instead of a meta id
+    :return:
+    >>> from pyvolution.types.gene import create_linear_mapping, create_chromosome_builder
+    >>> mapping, remapping = create_linear_mapping(4)
+    >>> spawner = create_individual_builder(create_chromosome_builder(list, mapping), create_sequential_naming())
+    >>> pool = (spawner(('AAAA', 'aaaa'), 0), spawner(('BBBB', 'bbbb'), 0), spawner(('CCCC', 'cccc'), 0))
+    >>> birth = create_batch_birth_builder(
+    ...     create_sequential_naming(lambda x: x + 3), individual_type=CompactIndividual
+    ... )
+    >>> children = birth(pool, [(0, 1), (1, 2), (2, 0)], 1)
+    >>> [(child.name, child.generation, child.parents) for child in children]
+    [(3, 1, (0, 1)), (4, 1, (1, 2)), (5, 1, (2, 0))]
+    >>> sorted(''.join(c.values()).upper() for c in children[1].karyogram[0])
+    ['BBBB', 'CCCC']
+    """
+    select = select if select else partial(select_halves, rng=rng)
+    meta_id = meta_id if meta_id is not None else Counter()
+    compact = isinstance(individual_type, type) and issubclass(individual_type, CompactIndividual)
+
+    def give_births(
+            pool: Sequence[Individual],
+            parent_rows: Sequence[Sequence[int]],
+            generation: int
+    ) -> List[Individual]:
+        rows = [tuple(pool[index] for index in row) for row in parent_rows]
+        gametes = iter(xover(select([parent.karyogram for parents in rows for parent in parents])))
+        children = list()
+        for parents in rows:
+            karyogram = anomaly(merge(islice(gametes, len(parents))))
+            name = naming(generation, parents)
+            if compact:
+                children.append(
+                    individual_type(karyogram, generation, name, parents=tuple(parent.name for parent in parents))
+                )
+            else:
+                children.append(
+                    individual_type(karyogram=karyogram, generation=generation, name=name, meta=dict(id=next(meta_id)))
+                )
+        return children
+    return give_births
@@ -1,10 +1,12 @@
-from typing import Sequence, Iterator, Callable, Generator, cast, Iterable, TypeVar, Tuple
-from random import choice
+from typing import Sequence, Iterator, Callable, Generator, cast, Iterable, TypeVar, Tuple, List
 from functools import reduce
-from operator import add
-from itertools import cycle
+from operator import add, itemgetter
+from itertools import cycle, compress
 from pyvolution.types.gene import DataType
-from pyvolution.types.individual import Individual, Birthing, Spawning, create_sample_individual
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM
+from pyvolution.types.individual import (
+    Individual, Birthing, BatchBirthing, Spawning, BatchSpawning, create_sample_individual
+)
 
 
 Fitness = TypeVar('Fitness')
@@ -13,16 +15,23 @@ Population = Iterable[Individual]
 RankedPopulation = Iterable[Tuple[Individual, Fitness]]
 MateSelector = Callable[[Population, int], Iterator[Sequence[Individual]]]
 ChildrenSpawn = Callable[[Population, int, int], Iterator[Individual]]
+BatchMateSelector = Callable[[Sequence[Individual], int], Sequence[Sequence[int]]]
 EntropySource = Generator[Iterator[DataType], None, None]
+BatchEntropySource = Callable[[int], Sequence[DataType]]
 Survival = Callable[[RankedPopulation], RankedPopulation]
 SurvivalIndication = Callable[[Fitness], bool]
 GrowthDetermination = Callable[[RankedPopulation], int]
 
 
-def build_choice_entropy_source(basis: Sequence[DataType], length: int) -> EntropySource:
+def build_choice_entropy_source(
+        basis: Sequence[DataType],
+        length: int,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> EntropySource:
     """
     :param basis:
     :param length:
+    :param rng:
     :return:
     >>> data = [tuple(x) for (i, x) in zip(range(2), build_choice_entropy_source(list(range(4)), 8))]
     >>> len(data[0]) == len(data[1]) == 8
@@ -31,26 +40,79 @@ def build_choice_entropy_source(basis: Sequence[DataType], length: int) -> Entro
     True
     """
     while True:
-        yield (choice(basis) for _ in range(length))
+        yield iter(rng.choices(basis, k=length))
 
 
-def build_additive_entropy_source(basis: Sequence[DataType], size: int, length: int) -> EntropySource:
+def build_additive_entropy_source(
+        basis: Sequence[DataType],
+        size: int,
+        length: int,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> EntropySource:
     """
     :param basis:
     :param size:
     :param length:
+    :param rng:
     :return:
     >>> data = list(tuple(x) for (i, x) in zip(range(3), build_additive_entropy_source('ABCDEFGH', 4, 2)))
     >>> [all(z in 'ABCDEFGH' for y in x for z in y) for x in data]
     [True, True, True]
     """
     while True:
+        items = rng.choices(basis, k=size * length)
         yield (
-            reduce(add, (choice(basis) for _ in range(size-1)), choice(basis))
-            for _ in range(length)
+            reduce(add, items[offset + 1:offset + size], items[offset])
+            for offset in range(0, size * length, size)
         )
 
 
+def build_choice_batch_source(
+        basis: Sequence[DataType],
+        length: int,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> BatchEntropySource:
+    """
+    Batch counterpart of build_choice_entropy_source: draws the data of a given number of individuals at once.
+    :param basis:
+    :param length:
+    :param rng:
+    :return:
+    >>> data = build_choice_batch_source(list(range(4)), 8)(3)
+    >>> len(data), all(x in range(4) for x in data)
+    (24, True)
+    """
+    def draw_population(amount: int) -> List[DataType]:
+        return rng.choices(basis, k=amount * length)
+    return draw_population
+
+
+def build_additive_batch_source(
+        basis: Sequence[DataType],
+        size: int,
+        length: int,
+        rng: RandomSource=GLOBAL_RANDOM
+) -> BatchEntropySource:
+    """
+    Batch counterpart of build_additive_entropy_source, string bases are joined at once instead of being
+    added character by character.
+    :param basis:
+    :param size:
+    :param length:
+    :param rng:
+    :return:
+    >>> data = build_additive_batch_source('ABCDEFGH', 4, 2)(3)
+    >>> len(data), all(len(x) == 4 and set(x) <= set('ABCDEFGH') for x in data)
+    (6, True)
+    """
+    join = ''.join if isinstance(basis, str) else lambda items: reduce(add, items[1:], items[0])
+
+    def draw_population(amount: int) -> List[DataType]:
+        items = rng.choices(basis, k=amount * length * size)
+        return [join(items[offset:offset + size]) for offset in range(0, len(items), size)]
+    return draw_population
+
+
 def create_population_builder(
         spawn: Spawning,
         entropy: EntropySource
@@ -81,6 +143,29 @@ def create_population_builder(
     return build_population
 
 
+def create_batch_population_builder(
+        spawn: BatchSpawning,
+        entropy: BatchEntropySource
+) -> Callable[[int, int], List[Individual]]:
+    """
+    :param spawn:
+    :param entropy:
+    :return:
+    >>> from string import ascii_uppercase
+    >>> from pyvolution.types.gene import create_linear_mapping, create_chromosome_builder
+    >>> from pyvolution.types.individual import create_batch_individual_builder, create_sequential_naming
+    >>> mapping, remapping = create_linear_mapping(4)
+    >>> builder = create_chromosome_builder(list, mapping)
+    >>> spawner = create_batch_individual_builder(builder, create_sequential_naming())
+    >>> population = create_batch_population_builder(spawner, build_additive_batch_source(ascii_uppercase, 8, 2))(3)
+    >>> [i.name for i in population], [len(cs) for i in population for cs in i.karyogram.values()]
+    ([0, 1, 2], [2, 2, 2, 2, 2, 2])
+    """
+    def build_population(amount: int, generation: int=0) -> List[Individual]:
+        return spawn(entropy(amount), amount, generation)
+    return build_population
+
+
 def top_selector(num_parents: int, population: Population, amount: int) -> Iterator[Sequence[Individual]]:
     """
     :param num_parents:
@@ -98,6 +183,41 @@ def top_selector(num_parents: int, population: Population, amount: int) -> Itera
     )
 
 
+def top_index_selector(num_parents: int, pool: Sequence[Individual], amount: int) -> List[Tuple[int, ...]]:
+    """
+    Index counterpart of top_selector.
+    :param num_parents:
+    :param pool:
+    :param amount:
+    :return:
+    >>> # noinspection PyTypeChecker
+    >>> top_index_selector(3, list(range(10)), 4)
+    [(0, 1, 2), (3, 4, 5), (6, 7, 8), (9, 0, 1)]
+    """
+    size = len(pool)
+    return [
+        tuple((child * num_parents + parent) % size for parent in range(num_parents))
+        for child in range(amount)
+    ] if size else list()
+
+
+def create_batch_children_builder(selector: BatchMateSelector, birth: BatchBirthing) -> ChildrenSpawn:
+    """
+    :param selector:
+    :param birth:
+    :return:
+    >>> from functools import partial
+    >>> from pyvolution.types.individual import create_batch_birth_builder, create_sequential_naming
+    >>> breed = create_batch_children_builder(partial(top_index_selector, 2), create_batch_birth_builder(create_sequential_naming()))
+    >>> [len(child.karyogram[0]) for child in breed(create_sample_population(4), 3, 1)]
+    [2, 2, 2]
+    """
+    def spawn_children(population: Population, amount: int, generation: int) -> Iterator[Individual]:
+        pool = tuple(population)
+        return iter(birth(pool, selector(pool, amount), generation))
+    return spawn_children
+
+
 def create_children_builder(selector: MateSelector, birth: Birthing) -> ChildrenSpawn:
     """
     :param selector:
@@ -116,10 +236,15 @@ def create_children_builder(selector: MateSelector, birth: Birthing) -> Children
 def create_survival_strategy_by_indication(
         fitness_evaluation: Callable[[Fitness], bool]
 ) -> Survival:
+    """
+    :param fitness_evaluation:
+    :return:
+    >>> create_survival_strategy_by_indication(lambda f: f > 1.0)([('a', 1.0), ('b', 3.0), ('c', 2.0)])
+    [('b', 3.0), ('c', 2.0)]
+    """
     def determine_survivors(population: RankedPopulation) -> RankedPopulation:
-        return (
-            (member, fitness) for (member, fitness) in population if fitness_evaluation(fitness)
-        )
+        ranked = list(population)
+        return list(compress(ranked, map(fitness_evaluation, map(itemgetter(1), ranked))))
     return determine_survivors
 
 
@@ -140,4 +265,20 @@ def create_sample_population(population_size: int=10, **kwargs) -> Sequence[Indi
     return [
         create_sample_individual(**kwargs)
         for _ in range(population_size)
-    ]
\ No newline at end of file
+    ]
+
+def count_distinct_chromosomes(population: Population) -> int:
+    """
+    :param population:
+    :return:
+    >>> from pyvolution.mutation import mutate
+    >>> population = create_sample_population(4, size=2, haplodity=2)
+    >>> count_distinct_chromosomes(population)
+    16
+    >>> count_distinct_chromosomes(population + [mutate(lambda x: x, i) for i in population])
+    16
+    """
+    return len(
+        {id(chromosome) for individual in population for chromosomes in individual.karyogram.values()
+         for chromosome in chromosomes}
+    )
@@ -0,0 +1,192 @@
+from typing import Callable, Sequence, Tuple, List
+from itertools import accumulate
+from pyvolution.types.gene import Chromosome, Karyogram, Crossover, BatchCrossover
+from pyvolution.types.rng import RandomSource, GLOBAL_RANDOM
+from pyvolution.xover import XoverSectionSelector, Xover
+
+ChromosomePair = Tuple[Chromosome, Chromosome]
+Mask = bytes
+MaskSource = Callable[[Sequence[ChromosomePair]], List[Mask]]
+BatchXover = Callable[[Sequence[ChromosomePair]], List[ChromosomePair]]
+
+BITS_TO_MASK = bytes.maketrans(b'01', b'\x00\x01')
+SWAP = bytes.maketrans(b'\x00\x01', b'\x01\x00')
+
+
+def common_lengths(pairs: Sequence[ChromosomePair]) -> List[int]:
+    return [min(len(left), len(right)) for (left, right) in pairs]
+
+
+def create_one_point_masks(rng: RandomSource=GLOBAL_RANDOM) -> MaskSource:
+    """
+    Every pair swaps the genes behind one random cut.
+    :param rng:
+    :return:
+    >>> masks = create_one_point_masks()([({0: 1, 1: 2, 2: 3}, {0: 4, 1: 5, 2: 6})] * 100)
+    >>> sorted(set(masks))
+    [b'\\x00\\x00\\x01', b'\\x00\\x01\\x01']
+    """
+    def draw_masks(pairs: Sequence[ChromosomePair]) -> List[Mask]:
+        masks = list()
+        for length in common_lengths(pairs):
+            cut = rng.randrange(1, length) if length > 1 else length
+            masks.append(bytes(cut) + b'\x01' * (length - cut))
+        return masks
+    return draw_masks
+
+
+def create_k_point_masks(points: int, rng: RandomSource=GLOBAL_RANDOM) -> MaskSource:
+    """
+    Every pair alternates between keeping and swapping genes at points random cuts (fewer if the chromosomes
+    are too short).
+    :param points:
+    :param rng:
+    :return:
+    >>> masks = create_k_point_masks(2)([(dict.fromkeys(range(6), 0), dict.fromkeys(range(6), 1))] * 50)
+    >>> all(len(m) == 6 and m[0] == 0 and sum(a != b for (a, b) in zip(m, m[1:])) == 2 for m in masks)
+    True
+    """
+    def draw_masks(pairs: Sequence[ChromosomePair]) -> List[Mask]:
+        masks = list()
+        for length in common_lengths(pairs):
+            cuts = sorted(rng.sample(range(1, length), min(points, max(length - 1, 0)))) + [length]
+            mask = bytearray(cuts[0])
+            for (section, (start, end)) in enumerate(zip(cuts, cuts[1:])):
+                mask.extend((b'\x01' if section % 2 == 0 else b'\x00') * (end - start))
+            masks.append(bytes(mask))
+        return masks
+    return draw_masks
+
+
+def create_uniform_masks(probability: float=0.5, rng: RandomSource=GLOBAL_RANDOM) -> MaskSource:
+    """
+    Every gene is swapped with the given probability. For the default probability the masks of the whole batch
+    are taken from a single getrandbits call.
+    :param probability:
+    :param rng:
+    :return:
+    >>> masks = create_uniform_masks()([({0: 1, 1: 2}, {0: 3, 1: 4, 2: 5})] * 200)
+    >>> sorted(set(masks))
+    [b'\\x00\\x00', b'\\x00\\x01', b'\\x01\\x00', b'\\x01\\x01']
+    >>> create_uniform_masks(0.0)([({0: 1}, {0: 2})])
+    [b'\\x00']
+    """
+    def draw_masks(pairs: Sequence[ChromosomePair]) -> List[Mask]:
+        lengths = common_lengths(pairs)
+        total = sum(lengths)
+        if probability == 0.5:
+            bits = format(rng.getrandbits(total), '0{0}b'.format(total)).encode('ascii').translate(BITS_TO_MASK)
+        else:
+            bits = bytes(rng.random() < probability for _ in range(total))
+        offsets = list(accumulate(lengths, initial=0))
+        return [bits[start:end] for (start, end) in zip(offsets, offsets[1:])]
+    return draw_masks
+
+
+def create_section_masks(selector: XoverSectionSelector) -> MaskSource:
+    """
+    Uses a section selector of the xover module, e.g. split_section_half, as mask.
+    :param selector:
+    :return:
+    >>> from pyvolution.xover import split_section_half
+    >>> create_section_masks(split_section_half)([(dict.fromkeys(range(4), 0), dict.fromkeys(range(6), 1))])
+    [b'\\x01\\x01\\x00\\x00']
+    """
+    def draw_masks(pairs: Sequence[ChromosomePair]) -> List[Mask]:
+        return [
+            bytes(section for (_, section) in zip(range(length), selector(left, right)))
+            for ((left, right), length) in zip(pairs, common_lengths(pairs))
+        ]
+    return draw_masks
+
+
+def apply_mask(left: Chromosome, right: Chromosome, mask: Mask) -> ChromosomePair:
+    """
+    Swaps the genes at the positions where the mask is set; genes beyond the mask keep their chromosome.
+    :param left:
+    :param right:
+    :param mask:
+    :return:
+    >>> apply_mask({0: 'a', 1: 'b', 2: 'c'}, {0: 'A', 1: 'B'}, b'\\x01\\x00')
+    ({0: 'A', 1: 'b', 2: 'c'}, {0: 'a', 1: 'B'})
+    """
+    length = len(mask)
+    left_genes, right_genes = list(left.values()), list(right.values())
+    pairs = list(zip(left_genes, right_genes))
+    new_left = list(map(tuple.__getitem__, pairs, mask))
+    new_right = list(map(tuple.__getitem__, pairs, mask.translate(SWAP)))
+    new_left.extend(left_genes[length:])
+    new_right.extend(right_genes[length:])
+    return type(left)(zip(left.keys(), new_left)), type(right)(zip(right.keys(), new_right))
+
+
+def create_batch_xover(masks: MaskSource) -> BatchXover:
+    """
+    :param masks:
+    :return:
+    >>> xover = create_batch_xover(create_section_masks(lambda l, r: (True, False)))
+    >>> xover([({0: 1, 1: 2}, {0: 3, 1: 4}), ({0: 5}, {0: 6})])
+    [({0: 3, 1: 2}, {0: 1, 1: 4}), ({0: 6}, {0: 5})]
+    """
+    def cross_pairs(pairs: Sequence[ChromosomePair]) -> List[ChromosomePair]:
+        return list(map(apply_mask, *zip(*pairs), masks(pairs))) if pairs else list()
+    return cross_pairs
+
+
+def create_mask_xover(masks: MaskSource) -> Xover:
+    """
+    Adapter to the Xover signature of the xover module.
+    :param masks:
+    :return:
+    """
+    batch = create_batch_xover(masks)
+
+    def apply_xover(left: Chromosome, right: Chromosome) -> ChromosomePair:
+        return batch([(left, right)])[0]
+    return apply_xover
+
+
+def create_batch_mask_crossover(masks: MaskSource) -> BatchCrossover:
+    """
+    Crosses the chromosomes at every position of every karyogram of the batch pairwise (first with second,
+    third with fourth, an odd one is kept), drawing the masks of the whole batch at once.
+    :param masks:
+    :return:
+    >>> crossover = create_batch_mask_crossover(create_section_masks(lambda l, r: (True, False)))
+    >>> crossover([{0: ({0: 'a', 1: 'b'}, {0: 'A', 1: 'B'}, {0: 'x'})}, {1: ({0: 'c'}, {0: 'C'})}])
+    [{0: ({0: 'A', 1: 'b'}, {0: 'a', 1: 'B'}, {0: 'x'})}, {1: ({0: 'C'}, {0: 'c'})}]
+    """
+    batch = create_batch_xover(masks)
+
+    def cross_karyograms(karyograms: Sequence[Karyogram]) -> List[Karyogram]:
+        pairs = [
+            (chromosomes[index], chromosomes[index + 1])
+            for karyogram in karyograms for chromosomes in karyogram.values()
+            for index in range(0, len(chromosomes) - 1, 2)
+        ]
+        crossed = iter(batch(pairs))
+        results = list()
+        for karyogram in karyograms:
+            result = dict()
+            for (position, chromosomes) in karyogram.items():
+                paired = [chromosome for _ in range(len(chromosomes) // 2) for chromosome in next(crossed)]
+                result[position] = type(chromosomes)(paired + list(chromosomes[len(paired):]))
+            results.append(result if type(karyogram) is dict else type(karyogram)(result))
+        return results
+    return cross_karyograms
+
+
+def create_mask_crossover(masks: MaskSource) -> Crossover:
+    """
+    Adapter to the Crossover signature of create_crossover.
+    :param masks:
+    :return:
+    >>> crossover = create_mask_crossover(create_uniform_masks(1.0))
+    >>> crossover({0: [{0: 1, 1: 2}, {0: 3, 1: 4}]})
+    {0: [{0: 3, 1: 4}, {0: 1, 1: 2}]}
+    """
+    batch = create_batch_mask_crossover(masks)
+
+    def crossover(karyogram: Karyogram) -> Karyogram:
+        return batch([karyogram])[0]
+    return crossover